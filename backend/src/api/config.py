@@ -50,9 +50,9 @@ class APISettings(BaseSettings):
                 "sasl.mechanism": "PLAIN",
                 "sasl.username": self.kafka_api_key,
                 "sasl.password": self.kafka_api_secret,
-                "acks": "1",
+                "acks": "all",  # Required by enable.idempotence
                 "enable.idempotence": True,  # Prevent duplicates
-                "compression.type": "snappy",  # Optimize bandwidth
+                "compression.type": "lz4",  # Cheaper to compress than snappy
                 "linger.ms": 10,  # Improved batching throughput
                 "client.id": self.kafka_client_id,
             }
@@ -11,6 +11,22 @@ downstream consumers.
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime, timezone
+import time
+
+
+# Health responses only need second-level precision, so one datetime is
+# reused per second instead of constructing a new one for every probe.
+# Stored as a single tuple so readers never see a torn update.
+_cached_now: tuple[int, datetime] = (0, datetime.fromtimestamp(0, timezone.utc))
+
+
+def cached_utc_now() -> datetime:
+    """Return the current UTC time, refreshed at most once per second."""
+    global _cached_now
+    now_ns = time.time_ns()
+    if now_ns - _cached_now[0] >= 1_000_000_000:
+        _cached_now = (now_ns, datetime.fromtimestamp(now_ns / 1e9, timezone.utc))
+    return _cached_now[1]
 
 
 class PressEventMessage(BaseModel):
@@ -40,9 +56,12 @@ class PressEventMessage(BaseModel):
         """Ensure request_id is a valid hex string."""
         if not v:
             raise ValueError("request_id cannot be empty")
-        # Should be valid hex (UUID without dashes)
+        # Should be valid hex (UUID without dashes). bytes.fromhex skips
+        # whitespace between pairs, so reject that before decoding.
         try:
-            int(v, 16)
+            if not v.isalnum():
+                raise ValueError
+            bytes.fromhex(v)
         except ValueError:
             raise ValueError("request_id must be a valid hex string")
         return v
@@ -118,7 +137,7 @@ class HealthStatus(BaseModel):
         description="Individual component health checks",
     )
     timestamp: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
+        default_factory=cached_utc_now,
         description="When the health check was performed",
     )
 
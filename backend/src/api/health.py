@@ -14,15 +14,22 @@ These are used by:
 
 import time
 import logging
-from typing import Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
 from dataclasses import dataclass
 from confluent_kafka import Producer
 import redis
 
 logger = logging.getLogger(__name__)
 
+# How long (seconds) a health check result is reused before the backend is
+# queried again. Probes from load balancers / Kubernetes arrive every few
+# seconds per replica, so this collapses probe storms into one real check.
+HEALTH_CHECK_CACHE_TTL_SECONDS = 5.0
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class HealthCheckResult:
     """Result of a health check."""
 
@@ -31,21 +38,89 @@ class HealthCheckResult:
     message: Optional[str] = None
 
 
-def check_redis_health(redis_client: redis.Redis, timeout: float = 5.0) -> HealthCheckResult:
+# =============================================================================
+# Result Caching
+# =============================================================================
+
+# Component name -> (monotonic timestamp, result). Keyed by component rather
+# than client, since each process holds a single client per dependency.
+_cache: dict[str, Tuple[float, HealthCheckResult]] = {}
+
+# One lock per cache key so concurrent probes coalesce into a single check
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _cached(
+    key: str, ttl: float, fn: Callable[[], HealthCheckResult]
+) -> HealthCheckResult:
+    """
+    Return the cached result for `key` if younger than `ttl`, else run `fn`.
+
+    Uses time.monotonic() so wall-clock adjustments can't keep a stale
+    result alive. A ttl <= 0 disables caching.
+    """
+    if ttl <= 0:
+        return fn()
+
+    entry = _cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+
+    with lock:
+        # Another probe may have refreshed the entry while we waited
+        entry = _cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        result = fn()
+        _cache[key] = (time.monotonic(), result)
+        return result
+
+
+def clear_health_cache() -> None:
+    """Drop all cached health check results and their locks."""
+    with _locks_guard:
+        _cache.clear()
+        _locks.clear()
+
+
+# =============================================================================
+# Health Checks
+# =============================================================================
+
+
+def check_redis_health(
+    redis_client: redis.Redis,
+    timeout: float = 5.0,
+    cache_ttl: float = HEALTH_CHECK_CACHE_TTL_SECONDS,
+) -> HealthCheckResult:
     """
     Check Redis connectivity by sending a PING command.
 
     Args:
         redis_client: Redis client instance
         timeout: Timeout in seconds for the health check
+        cache_ttl: Seconds to reuse a previous result (0 disables caching)
 
     Returns:
         HealthCheckResult with status and latency
     """
+    return _cached(
+        "redis",
+        cache_ttl,
+        lambda: _check_redis_health(redis_client, timeout),
+    )
+
+
+def _check_redis_health(redis_client: redis.Redis, timeout: float) -> HealthCheckResult:
     try:
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         result = redis_client.ping()
-        latency_ms = (time.perf_counter() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
 
         if result:
             return HealthCheckResult(
@@ -78,7 +153,11 @@ def check_redis_health(redis_client: redis.Redis, timeout: float = 5.0) -> Healt
         )
 
 
-def check_kafka_health(producer: Producer, timeout: float = 5.0) -> HealthCheckResult:
+def check_kafka_health(
+    producer: Producer,
+    timeout: float = 5.0,
+    cache_ttl: float = HEALTH_CHECK_CACHE_TTL_SECONDS,
+) -> HealthCheckResult:
     """
     Check Kafka connectivity by listing topics.
 
@@ -89,14 +168,23 @@ def check_kafka_health(producer: Producer, timeout: float = 5.0) -> HealthCheckR
     Args:
         producer: Kafka Producer instance
         timeout: Timeout in seconds for the health check
+        cache_ttl: Seconds to reuse a previous result (0 disables caching)
 
     Returns:
         HealthCheckResult with status and latency
     """
+    return _cached(
+        "kafka",
+        cache_ttl,
+        lambda: _check_kafka_health(producer, timeout),
+    )
+
+
+def _check_kafka_health(producer: Producer, timeout: float) -> HealthCheckResult:
     try:
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         metadata = producer.list_topics(timeout=timeout)
-        latency_ms = (time.perf_counter() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
 
         # Check that we got valid metadata
         if metadata and len(metadata.brokers) > 0:
@@ -119,27 +207,40 @@ def check_kafka_health(producer: Producer, timeout: float = 5.0) -> HealthCheckR
         )
 
 
-def check_database_health(session_factory, timeout: float = 5.0) -> HealthCheckResult:
+def check_database_health(
+    session_factory,
+    timeout: float = 5.0,
+    cache_ttl: float = HEALTH_CHECK_CACHE_TTL_SECONDS,
+) -> HealthCheckResult:
     """
     Check database connectivity by executing a simple query.
 
     Args:
         session_factory: SQLAlchemy sessionmaker
         timeout: Timeout in seconds for the health check
+        cache_ttl: Seconds to reuse a previous result (0 disables caching)
 
     Returns:
         HealthCheckResult with status and latency
     """
+    return _cached(
+        "database",
+        cache_ttl,
+        lambda: _check_database_health(session_factory, timeout),
+    )
+
+
+def _check_database_health(session_factory, timeout: float) -> HealthCheckResult:
     try:
         from sqlalchemy import text
 
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
 
         with session_factory() as session:
             result = session.execute(text("SELECT 1"))
             result.fetchone()
 
-        latency_ms = (time.perf_counter() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
 
         return HealthCheckResult(
             healthy=True,
@@ -154,6 +255,50 @@ def check_database_health(session_factory, timeout: float = 5.0) -> HealthCheckR
         )
 
 
+def gather_health(
+    checks: dict[str, Callable[[], HealthCheckResult]],
+) -> dict[str, HealthCheckResult]:
+    """
+    Run health checks concurrently and collect their results.
+
+    The checks are blocking network calls, so running them on threads makes
+    total latency roughly the slowest check instead of the sum of all checks.
+
+    Args:
+        checks: Dictionary of component name to zero-argument check callable
+
+    Returns:
+        Dictionary of component name to HealthCheckResult, ready to be
+        passed to aggregate_health()
+    """
+    if len(checks) <= 1:
+        return {name: _run_check(name, check) for name, check in checks.items()}
+
+    with ThreadPoolExecutor(
+        max_workers=len(checks), thread_name_prefix="health-check"
+    ) as executor:
+        futures = {
+            name: executor.submit(_run_check, name, check)
+            for name, check in checks.items()
+        }
+
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _run_check(
+    name: str, check: Callable[[], HealthCheckResult]
+) -> HealthCheckResult:
+    """Run a single check, converting any escaped exception to unhealthy."""
+    try:
+        return check()
+    except Exception as e:
+        logger.error(f"Unexpected error in {name} health check: {e}")
+        return HealthCheckResult(
+            healthy=False,
+            message=f"Unexpected error: {str(e)}",
+        )
+
+
 def aggregate_health(
     checks: dict[str, HealthCheckResult],
 ) -> Tuple[str, dict]:
@@ -168,24 +313,26 @@ def aggregate_health(
         - overall_status: "healthy", "degraded", or "unhealthy"
         - checks_dict: Dictionary suitable for JSON response
     """
-    all_healthy = all(c.healthy for c in checks.values())
-    any_healthy = any(c.healthy for c in checks.values())
+    healthy = unhealthy = 0
+    checks_dict = {}
 
-    if all_healthy:
-        status = "healthy"
-    elif any_healthy:
-        status = "degraded"
-    else:
-        status = "unhealthy"
-
-    checks_dict = {
-        name: {
+    # Single pass: count outcomes and build the response dict together
+    for name, result in checks.items():
+        if result.healthy:
+            healthy += 1
+        else:
+            unhealthy += 1
+        checks_dict[name] = {
             "status": "healthy" if result.healthy else "unhealthy",
             "latency_ms": result.latency_ms,
             "message": result.message,
         }
-        for name, result in checks.items()
-    }
 
-    return status, checks_dict
+    if unhealthy == 0:
+        status = "healthy"
+    elif healthy > 0:
+        status = "degraded"
+    else:
+        status = "unhealthy"
 
+    return status, checks_dict
@@ -16,6 +16,7 @@ Dev Mode:
 - Or use difficulty=0 challenges which accept any nonce
 """
 
+import base64
 import hashlib
 import hmac
 import os
@@ -50,11 +51,17 @@ CHALLENGE_TTL_SECONDS = 30
 # In production, load this from environment/secrets manager
 POW_SECRET_KEY = secrets.token_bytes(32)
 
+# Keyed HMAC state (ipad/opad already absorbed), cloned for each signature
+_HMAC_TEMPLATE = hmac.new(POW_SECRET_KEY, None, hashlib.sha256)
+
+# Zero-byte prefixes indexed by length, covering every possible SHA256 target
+_ZERO_PREFIXES = tuple(b"\x00" * n for n in range(hashlib.sha256().digest_size + 1))
+
 # Redis key prefix for used challenges
 USED_CHALLENGE_PREFIX = "pow:used:"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Challenge:
     """A PoW challenge issued to a client."""
     challenge_id: str  # Random unique ID
@@ -71,7 +78,7 @@ class Challenge:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Solution:
     """A PoW solution submitted by client."""
     challenge_id: str
@@ -87,9 +94,15 @@ class Solution:
 
 
 def _sign_challenge(challenge_id: str, difficulty: int, expires_at: int) -> str:
-    """Create HMAC signature for challenge to prevent tampering."""
+    """
+    Create HMAC signature for challenge to prevent tampering.
+
+    The tag is encoded as unpadded base64url (43 chars vs 64 for hex).
+    """
     message = f"{challenge_id}:{difficulty}:{expires_at}".encode()
-    return hmac.new(POW_SECRET_KEY, message, hashlib.sha256).hexdigest()
+    h = _HMAC_TEMPLATE.copy()
+    h.update(message)
+    return base64.urlsafe_b64encode(h.digest()).rstrip(b"=").decode()
 
 
 def generate_challenge(difficulty: int = DEFAULT_DIFFICULTY) -> Challenge:
@@ -129,35 +142,44 @@ def _verify_signature(solution: Solution) -> bool:
     return hmac.compare_digest(expected, solution.signature)
 
 
-def _check_hash_difficulty(hash_hex: str, difficulty: int) -> bool:
-    """Check if hash has required number of leading zeros."""
-    return hash_hex.startswith("0" * difficulty)
+def _check_hash_difficulty(digest: bytes, difficulty: int) -> bool:
+    """
+    Check if digest has required number of leading hex zeros.
 
+    Works on raw bytes: N leading hex zeros == N // 2 zero bytes, plus a
+    zero high nibble on the next byte when N is odd.
+    """
+    if difficulty > 2 * len(digest):
+        return False
+    zero_bytes, odd_nibble = divmod(difficulty, 2)
+    if digest[:zero_bytes] != _ZERO_PREFIXES[zero_bytes]:
+        return False
+    return odd_nibble == 0 or digest[zero_bytes] < 0x10
 
-def _compute_solution_hash(challenge_id: str, nonce: str) -> str:
-    """Compute the hash that the client should have found."""
+
+def _compute_solution_digest(challenge_id: str, nonce: str) -> bytes:
+    """Compute the raw SHA256 digest that the client should have found."""
     data = f"{challenge_id}:{nonce}".encode()
-    return hashlib.sha256(data).hexdigest()
+    return hashlib.sha256(data).digest()
 
 
-def _is_challenge_used(redis_client: Redis, challenge_id: str) -> bool:
-    """Check if a challenge has already been used (replay protection)."""
-    try:
-        key = f"{USED_CHALLENGE_PREFIX}{challenge_id}"
-        return redis_client.exists(key) > 0
-    except Exception as e:
-        logger.warning(f"Failed to check challenge usage: {e}")
-        # Fail open - don't block if Redis is down
-        return False
+def _claim_challenge(redis_client: Redis, challenge_id: str, ttl: int) -> bool:
+    """
+    Atomically mark a challenge as used (replay protection).
 
+    Uses SET NX EX so the check and the mark happen in one round trip, and two
+    concurrent submissions of the same challenge can't both succeed.
 
-def _mark_challenge_used(redis_client: Redis, challenge_id: str, ttl: int) -> None:
-    """Mark a challenge as used to prevent replay attacks."""
+    Returns:
+        True if this call claimed the challenge, False if it was already used
+    """
     try:
         key = f"{USED_CHALLENGE_PREFIX}{challenge_id}"
-        redis_client.setex(key, ttl, "1")
+        return bool(redis_client.set(key, "1", nx=True, ex=ttl))
     except Exception as e:
-        logger.warning(f"Failed to mark challenge as used: {e}")
+        logger.warning(f"Failed to claim challenge: {e}")
+        # Fail open - don't block if Redis is down
+        return True
 
 
 def verify_solution(
@@ -170,8 +192,10 @@ def verify_solution(
     Checks:
     1. Signature is valid (challenge wasn't tampered)
     2. Challenge hasn't expired
-    3. Challenge hasn't been used before (replay protection)
-    4. Hash has required leading zeros
+    3. Hash has required leading zeros
+    4. Challenge hasn't been used before (replay protection)
+
+    The local checks run first so invalid submissions never touch Redis.
     
     Args:
         redis_client: Redis connection for replay protection
@@ -196,23 +220,20 @@ def verify_solution(
         logger.debug(f"Expired challenge {solution.challenge_id}")
         return False, "Challenge expired"
     
-    # 3. Check replay (challenge already used)
-    if _is_challenge_used(redis_client, solution.challenge_id):
-        logger.warning(f"Replay attempt for challenge {solution.challenge_id}")
-        return False, "Challenge already used"
-    
-    # 4. Verify the actual PoW solution
-    solution_hash = _compute_solution_hash(solution.challenge_id, solution.nonce)
-    if not _check_hash_difficulty(solution_hash, solution.difficulty):
+    # 3. Verify the actual PoW solution
+    solution_digest = _compute_solution_digest(solution.challenge_id, solution.nonce)
+    if not _check_hash_difficulty(solution_digest, solution.difficulty):
         logger.warning(
             f"Invalid PoW for challenge {solution.challenge_id}: "
-            f"hash {solution_hash[:16]}... doesn't have {solution.difficulty} leading zeros"
+            f"hash {solution_digest[:8].hex()}... doesn't have {solution.difficulty} leading zeros"
         )
         return False, "Invalid proof of work"
     
-    # Solution is valid - mark as used
+    # 4. Claim the challenge (replay protection) - fails if already used
     remaining_ttl = solution.expires_at - now + 5  # Small buffer
-    _mark_challenge_used(redis_client, solution.challenge_id, remaining_ttl)
+    if not _claim_challenge(redis_client, solution.challenge_id, remaining_ttl):
+        logger.warning(f"Replay attempt for challenge {solution.challenge_id}")
+        return False, "Challenge already used"
     
     logger.debug(f"Valid PoW solution for challenge {solution.challenge_id}")
     return True, None
@@ -237,14 +258,17 @@ def solve_challenge(challenge: Challenge) -> str:
         The nonce that solves the challenge
     """
     nonce = 0
-    target = "0" * challenge.difficulty
-    
+
+    # Absorb the "challenge_id:" prefix once and clone that state per nonce,
+    # so each iteration only hashes the nonce digits
+    base = hashlib.sha256(f"{challenge.challenge_id}:".encode())
+
     while True:
         nonce_str = str(nonce)
-        hash_result = _compute_solution_hash(challenge.challenge_id, nonce_str)
-        
-        if hash_result.startswith(target):
+        h = base.copy()
+        h.update(nonce_str.encode())
+
+        if _check_hash_difficulty(h.digest(), challenge.difficulty):
             return nonce_str
-        
-        nonce += 1
 
+        nonce += 1
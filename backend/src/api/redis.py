@@ -6,7 +6,7 @@ from shared.models import PersistedGlobalState
 from shared.constants import API_REDIS_STATE_UPDATE_CHANNEL
 from typing import AsyncGenerator
 from datetime import datetime
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -60,17 +60,16 @@ async def listen_on_pubsub(r: redis.Redis) -> AsyncGenerator[PersistedGlobalStat
         # listen() on async redis returns an async generator
         async for message in p.listen():
             if message["type"] == "message":
-                # Return type of message["data"] is str (if decode_responses=True)
-                raw_data = message["data"]
+                # Build the state straight from the StateUpdateMessage fields
+                data = orjson.loads(message["data"])
+                created_at = data.get("created_at")
 
-                # Convert str to dict for processing
-                data_dict = json.loads(raw_data)
-                
-                # Parse ISO datetime string back to datetime object
-                if data_dict.get("created_at"):
-                    data_dict["created_at"] = datetime.fromisoformat(data_dict["created_at"])
-                
-                yield PersistedGlobalState(**data_dict)
+                yield PersistedGlobalState(
+                    id=data["id"],
+                    last_applied_offset=data["last_applied_offset"],
+                    ruleshash=data["ruleshash"],
+                    created_at=datetime.fromisoformat(created_at) if created_at else None,
+                )
 
     except (ConnectionError, TimeoutError) as e:
         # Handle transient production errors (log/alert)
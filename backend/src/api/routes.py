@@ -10,7 +10,16 @@ from api.schemas import (
 )
 import uuid
 import time
-from shared.kafka import create_producer, send_message, flush_producer, KafkaException
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import redis
+from shared.kafka import (
+    Producer,
+    create_producer,
+    send_message,
+    flush_producer,
+    KafkaException,
+)
 import shared.constants as constants
 from shared.models import PersistedGlobalState
 import logging
@@ -20,21 +29,32 @@ from api.health import (
     check_redis_health,
     check_kafka_health,
     check_database_health,
+    gather_health,
     aggregate_health,
 )
 from api.ratelimiter import rate_limit_request, rate_limit_press, get_real_ip
 from api.pow import generate_challenge, verify_solution, Solution
 from api.config import settings
+from api.contracts import cached_utc_now
 import json
-from datetime import datetime
 
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the shared clients at startup rather than on the first request
+    get_producer()
+    get_redis()
+    yield
+
+
 app = FastAPI(
     title="The Button API",
     description="API for The Button game",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # =============================================================================
@@ -70,25 +90,72 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
-producer = create_producer(settings.kafka_config)
-redis_client = create_redis_connection()
+
+# =============================================================================
+# Client Dependencies
+# =============================================================================
+
+
+@lru_cache(maxsize=1)
+def get_producer() -> Producer:
+    """Dependency returning the process-wide Kafka producer."""
+    return create_producer(settings.kafka_config)
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """Dependency returning the process-wide Redis client."""
+    return create_redis_connection()
 
 
 # =============================================================================
-# Rate Limit Dependencies
+# Rate Limit & PoW Dependencies
 # =============================================================================
 
 
-def require_rate_limit(request: Request) -> str:
+def require_rate_limit(
+    request: Request, redis_client: redis.Redis = Depends(get_redis)
+) -> str:
     """Dependency that enforces general rate limiting. Returns client IP."""
     return rate_limit_request(request, redis_client)
 
 
-def require_press_rate_limit(request: Request) -> str:
+def require_press_rate_limit(
+    request: Request, redis_client: redis.Redis = Depends(get_redis)
+) -> str:
     """Dependency that enforces stricter rate limiting for press endpoint."""
     return rate_limit_press(request, redis_client)
 
 
+def require_valid_solution(
+    body: PressRequest,
+    client_ip: str = Depends(require_press_rate_limit),
+    redis_client: redis.Redis = Depends(get_redis),
+) -> str:
+    """
+    Dependency that verifies the press's proof-of-work solution.
+
+    Runs after the press rate limit so rejected clients never reach the
+    signature check. Returns client IP.
+    """
+    solution = Solution(
+        challenge_id=body.challenge_id,
+        difficulty=body.difficulty,
+        expires_at=body.expires_at,
+        signature=body.signature,
+        nonce=body.nonce,
+    )
+
+    is_valid, error = verify_solution(redis_client, solution)
+    if not is_valid:
+        logger.warning(f"Invalid PoW from {client_ip}: {error}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error or "Invalid proof of work",
+        )
+    return client_ip
+
+
 # =============================================================================
 # Challenge & Event Endpoints
 # =============================================================================
@@ -134,25 +201,9 @@ def get_challenge(client_ip: str = Depends(require_rate_limit)):
 )
 def press_button(
     body: PressRequest,
-    client_ip: str = Depends(require_press_rate_limit),
+    client_ip: str = Depends(require_valid_solution),
+    producer: Producer = Depends(get_producer),
 ):
-    # Verify proof-of-work solution
-    solution = Solution(
-        challenge_id=body.challenge_id,
-        difficulty=body.difficulty,
-        expires_at=body.expires_at,
-        signature=body.signature,
-        nonce=body.nonce,
-    )
-    
-    is_valid, error = verify_solution(redis_client, solution)
-    if not is_valid:
-        logger.warning(f"Invalid PoW from {client_ip}: {error}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error or "Invalid proof of work",
-        )
-    
     # PoW valid - process the button press
     req_id = uuid.uuid4().hex
     timestamp_ms = int(time.time() * 1000)
@@ -211,7 +262,11 @@ def get_current_state(_: str = Depends(require_rate_limit)):
         429: {"model": ErrorResponse, "description": "Rate limit exceeded"},
     },
 )
-async def stream_state(request: Request, _: str = Depends(require_rate_limit)):
+async def stream_state(
+    request: Request,
+    _: str = Depends(require_rate_limit),
+    redis_client: redis.Redis = Depends(get_redis),
+):
     async def event_generator():
         try:
             async for update in listen_on_pubsub(redis_client):
@@ -252,7 +307,10 @@ async def stream_state(request: Request, _: str = Depends(require_rate_limit)):
     summary="Overall health check",
     description="Returns health status of all dependencies. Use for load balancer health checks.",
 )
-def health_check():
+def health_check(
+    redis_client: redis.Redis = Depends(get_redis),
+    producer: Producer = Depends(get_producer),
+):
     """
     Comprehensive health check for all dependencies.
 
@@ -260,17 +318,19 @@ def health_check():
         - 200: All systems healthy
         - 503: One or more systems unhealthy
     """
-    checks = {
-        "redis": check_redis_health(redis_client),
-        "kafka": check_kafka_health(producer),
-        "database": check_database_health(SessionLocal),
-    }
+    checks = gather_health(
+        {
+            "redis": lambda: check_redis_health(redis_client),
+            "kafka": lambda: check_kafka_health(producer),
+            "database": lambda: check_database_health(SessionLocal),
+        }
+    )
 
     overall_status, checks_dict = aggregate_health(checks)
 
     response = {
         "status": overall_status,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": cached_utc_now().isoformat(),
         "checks": checks_dict,
     }
 
@@ -280,16 +340,21 @@ def health_check():
 
 
 @app.head("/health")
-def health_check_head():
+def health_check_head(
+    redis_client: redis.Redis = Depends(get_redis),
+    producer: Producer = Depends(get_producer),
+):
     """
     HEAD request handler for health check (used by load balancers/health checks).
     Returns same status code as GET but without body.
     """
-    checks = {
-        "redis": check_redis_health(redis_client),
-        "kafka": check_kafka_health(producer),
-        "database": check_database_health(SessionLocal),
-    }
+    checks = gather_health(
+        {
+            "redis": lambda: check_redis_health(redis_client),
+            "kafka": lambda: check_kafka_health(producer),
+            "database": lambda: check_database_health(SessionLocal),
+        }
+    )
 
     overall_status, _ = aggregate_health(checks)
     status_code = 200 if overall_status == "healthy" else 503
@@ -319,17 +384,22 @@ def liveness_probe():
     summary="Readiness probe",
     description="Kubernetes readiness probe. Returns 200 if ready to accept traffic.",
 )
-def readiness_probe():
+def readiness_probe(
+    redis_client: redis.Redis = Depends(get_redis),
+    producer: Producer = Depends(get_producer),
+):
     """
     Readiness check - confirms the service can handle requests.
 
     Checks critical dependencies (Kafka for producing, Redis for streaming).
     If this fails, Kubernetes will stop routing traffic to this pod.
     """
-    checks = {
-        "redis": check_redis_health(redis_client),
-        "kafka": check_kafka_health(producer),
-    }
+    checks = gather_health(
+        {
+            "redis": lambda: check_redis_health(redis_client),
+            "kafka": lambda: check_kafka_health(producer),
+        }
+    )
 
     overall_status, checks_dict = aggregate_health(checks)
 
@@ -1,51 +1,59 @@
-from sqlalchemy import create_engine, select
+from sqlalchemy import Row, select
 from sqlalchemy.orm import sessionmaker
+from shared.db import get_engine
 from shared.models import GlobalState
 from api.config import settings
 from typing import Any
 
 database_url = settings.database_url
 
-engine = create_engine(database_url, pool_pre_ping=True)
+engine = get_engine(database_url)
 SessionLocal = sessionmaker(bind=engine)
 
 
-def _orm_to_dict(orm_obj: GlobalState) -> dict[str, Any]:
-    """Convert a GlobalState ORM object to a dictionary for API response."""
-    return {
-        "id": orm_obj.id,
-        "last_applied_offset": orm_obj.last_applied_offset,
-        "updated_at_ms": orm_obj.updated_at_ms,
-        "counter": orm_obj.counter,
-        "phase": orm_obj.phase,
-        "entropy": orm_obj.entropy,
-        "reveal_until_ms": orm_obj.reveal_until_ms,
-        "cooldown_ms": orm_obj.cooldown_ms,
-        "created_at": orm_obj.created_at.isoformat() if orm_obj.created_at else None,
-    }
+# Selected as plain columns so reads skip ORM entity hydration
+_STATE_COLUMNS = (
+    GlobalState.id,
+    GlobalState.last_applied_offset,
+    GlobalState.updated_at_ms,
+    GlobalState.counter,
+    GlobalState.phase,
+    GlobalState.entropy,
+    GlobalState.reveal_until_ms,
+    GlobalState.cooldown_ms,
+    GlobalState.created_at,
+)
+
+
+def _row_to_dict(row: Row) -> dict[str, Any]:
+    """Convert a selected GlobalState row to a dictionary for API response."""
+    state = dict(row._mapping)
+    created_at = state["created_at"]
+    state["created_at"] = created_at.isoformat() if created_at else None
+    return state
 
 
 def get_latest_state() -> dict[str, Any]:
     with SessionLocal.begin() as db:
 
-        stmt = select(GlobalState).order_by(GlobalState.id.desc()).limit(1)
-        selected_state: GlobalState | None = db.execute(stmt).scalars().first()
+        stmt = select(*_STATE_COLUMNS).order_by(GlobalState.id.desc()).limit(1)
+        selected_state: Row | None = db.execute(stmt).first()
         if selected_state is None:
             raise LookupError("No global state found")
 
-        return _orm_to_dict(selected_state)
+        return _row_to_dict(selected_state)
 
 
 def get_state_by_id(id: int) -> dict[str, Any]:
     with SessionLocal.begin() as db:
         stmt = (
-            select(GlobalState)
+            select(*_STATE_COLUMNS)
             .where(GlobalState.id == id)
             .order_by(GlobalState.id.desc())
             .limit(1)
         )
-        selected_state: GlobalState | None = db.execute(stmt).scalars().first()
+        selected_state: Row | None = db.execute(stmt).first()
         if selected_state is None:
             raise LookupError("No global state found")
 
-        return _orm_to_dict(selected_state)
+        return _row_to_dict(selected_state)
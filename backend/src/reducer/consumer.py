@@ -1,8 +1,10 @@
 from reducer.config import settings
 from confluent_kafka import Consumer, Message
 from shared.constants import REDUCER_KAFKA_TOPIC
+from shared.models import PressEvent
 from typing import Dict, Union
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -40,3 +42,31 @@ def poll_batch_messages(
     if msgs:
         logger.debug(f"Successfully polled {len(msgs)} messages")
     return msgs if msgs else []
+
+
+def decode_press_events(msgs: list[Message]) -> list[PressEvent]:
+    """
+    Decode a batch of Kafka messages into PressEvents.
+
+    The press_button topic is internal (produced by our own API after
+    validation), so payloads are decoded straight into PressEvent without
+    re-running the PressEventMessage contract validation.
+
+    Args:
+        msgs: Messages returned by poll_batch_messages
+
+    Returns:
+        List of PressEvents in the same order as msgs
+    """
+    loads = orjson.loads  # parses the raw bytes payload directly
+    events: list[PressEvent] = []
+    for msg in msgs:
+        payload = loads(msg.value())
+        events.append(
+            PressEvent(
+                offset=msg.offset(),
+                timestamp_ms=payload["timestamp_ms"],
+                request_id=payload["request_id"],
+            )
+        )
+    return events
@@ -1,11 +1,9 @@
 from reducer.config import settings
-from reducer.consumer import create_consumer, poll_batch_messages
+from reducer.consumer import create_consumer, poll_batch_messages, decode_press_events
 from reducer.notify import create_redis_connection, publish_state_update
 from reducer.writer import write_state, get_latest_state, get_initial_state
 from reducer.updater import apply_batch
-from shared.models import PressEvent
 from shared.rules import get_latest_rules
-import json
 import logging
 import time
 
@@ -27,6 +25,12 @@ def main():
     else:
         logger.info(f"Loaded existing state: counter={state.counter}, offset={state.last_applied_offset}")
 
+    # Offsets are committed asynchronously after every batch, with a blocking
+    # commit at most once per commit interval (and on shutdown) so the broker
+    # round trip doesn't gate throughput on small batches
+    commit_interval_sec = settings.commit_interval_ms / 1000.0
+    last_commit_ts = time.monotonic()
+
     try:
         while True:
             try:
@@ -35,30 +39,44 @@ def main():
                     continue
 
                 if len(msgs) > 0:
-                    events: list[PressEvent] = []
-                    for msg in msgs:
-                        payload = json.loads(msg.value())
-                        events.append(
-                            PressEvent(
-                                offset=msg.offset(),
-                                timestamp_ms=payload["timestamp_ms"],
-                                request_id=payload["request_id"],
-                            )
+                    # Skip events already persisted (redelivered after a crash
+                    # between the DB write and the offset commit)
+                    decoded = decode_press_events(msgs)
+                    events = [
+                        e for e in decoded if e.offset > state.last_applied_offset
+                    ]
+                    skipped = len(decoded) - len(events)
+                    if skipped:
+                        # Also fires if the topic was recreated or offsets
+                        # reset below the persisted state
+                        logger.warning(
+                            "Skipped %d event(s) at or below last applied offset %d",
+                            skipped,
+                            state.last_applied_offset,
                         )
 
-                    new_state = apply_batch(state, events, rules_config, ruleset.hash)
-                    persisted_global_state = write_state(new_state)
-
-                    try:
-                        publish_state_update(redis, persisted_global_state)
-                    except:
-                        logger.warning(
-                            "Redis publish failed — continuing without blocking reducer"
+                    if events:
+                        new_state = apply_batch(
+                            state, events, rules_config, ruleset.hash
                         )
+                        persisted_global_state = write_state(new_state)
+
+                        try:
+                            publish_state_update(redis, persisted_global_state)
+                        except:
+                            logger.warning(
+                                "Redis publish failed — continuing without blocking reducer"
+                            )
+
+                        state = new_state
 
                     # commit up to the last offset in the batch
-                    consumer.commit(asynchronous=False)
-                    state = new_state
+                    now = time.monotonic()
+                    if now - last_commit_ts >= commit_interval_sec:
+                        consumer.commit(asynchronous=False)
+                        last_commit_ts = now
+                    else:
+                        consumer.commit(asynchronous=True)
 
             except Exception as batch_err:
                 if backoff_attempt >= settings.backoff_max_attempts:
@@ -82,6 +100,11 @@ def main():
         logger.info("Reducer shutting down gracefully...")
 
     finally:
+        try:
+            consumer.commit(asynchronous=False)
+        except Exception as e:
+            # Nothing consumed since the last commit, or broker unavailable
+            logger.warning(f"Final offset commit skipped: {e}")
         consumer.close()
         logger.info("Kafka consumer closed")
 
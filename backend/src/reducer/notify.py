@@ -3,7 +3,7 @@ import logging
 from reducer.config import settings
 from shared.models import PersistedGlobalState
 from shared.constants import REDUCER_REDIS_STATE_UPDATE_CHANNEL
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ def publish_state_update(r: redis.Redis, state: PersistedGlobalState):
         "ruleshash": state.ruleshash,
         "created_at": state.created_at.isoformat() if state.created_at else None,
     }
-    r.publish(REDUCER_REDIS_STATE_UPDATE_CHANNEL, json.dumps(msg))
+    r.publish(REDUCER_REDIS_STATE_UPDATE_CHANNEL, orjson.dumps(msg))
     logger.info(
         f"Published state update: id={state.id} offset={state.last_applied_offset}"
     )
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 from shared.models import RulesConfig, Phases
 
 
@@ -114,3 +114,74 @@ def compute_reveal_until_ms(
 
     # extend the reveal window, never shorten it
     return max(prev_reveal_until_ms, candidate)
+
+
+def fold_events(
+    entropy: float,
+    updated_at_ms: int,
+    reveal_until_ms: Optional[int],
+    timestamps_ms: Sequence[int],
+    rules: RulesConfig,
+) -> Tuple[float, Phases, Optional[int]]:
+    """Run `update_entropy` -> `transition_phase` -> `compute_reveal_until_ms`
+    over a non-empty, offset-ordered run of event timestamps in a single loop.
+
+    Rules are read once up front and phases are tracked as plain ints, so
+    the per-event work is arithmetic and int compares only. Results are
+    identical to calling the individual functions per event.
+
+    Args:
+        entropy (float): entropy before the first event
+        updated_at_ms (int): timestamp of the previous event (0 if none)
+        reveal_until_ms (Optional[int]): reveal time before the first event
+        timestamps_ms (Sequence[int]): event timestamps in offset order
+        rules (RulesConfig): ruleset applied to the calculations
+
+    Returns:
+        Tuple[float, Phases, Optional[int]]: final entropy, phase and reveal time
+    """
+    alpha = rules.entropy_alpha
+    decay = 1.0 - alpha
+    max_rate = rules.max_rate_for_entropy
+    calm, hot, chaos = rules.calm_threshold, rules.hot_threshold, rules.chaos_threshold
+    # indexed by Phases value; HOT shares the CHAOS reveal window
+    reveal_ms = (
+        rules.reveal_calm_ms,
+        rules.reveal_warm_ms,
+        rules.reveal_chaos_ms,
+        rules.reveal_chaos_ms,
+    )
+
+    phase = 0
+    prev_ms = updated_at_ms
+    # min()/max() are spelled out as comparisons: builtin calls dominate
+    # the cost of this loop, and the results are bit-for-bit the same
+    for ts in timestamps_ms:
+        if prev_ms == 0:
+            intensity = 1.0
+        else:
+            dt_ms = ts - prev_ms
+            dt_sec = (dt_ms if dt_ms > 1 else 1) / 1000.0
+            rate = 1.0 / (dt_sec if dt_sec > 1e-3 else 1e-3)
+            intensity = (rate if rate < max_rate else max_rate) / max_rate
+        entropy = decay * entropy + alpha * intensity
+        if entropy > 1.0:
+            entropy = 1.0
+        elif entropy < 0.0:
+            entropy = 0.0
+
+        if entropy < calm:
+            phase = 0
+        elif entropy < hot:
+            phase = 1
+        elif entropy < chaos:
+            phase = 2
+        else:
+            phase = 3
+
+        candidate = ts + reveal_ms[phase]
+        if reveal_until_ms is None or candidate > reveal_until_ms:
+            reveal_until_ms = candidate
+        prev_ms = ts
+
+    return entropy, Phases(phase), reveal_until_ms
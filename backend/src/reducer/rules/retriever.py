@@ -1,12 +1,13 @@
-from sqlalchemy import create_engine, select
+from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
+from shared.db import get_engine
 from shared.models import Ruleset, RulesConfig, RulesetEntity
 from reducer.config import settings
 from typing import Tuple
 
 database_url = settings.database_url
 
-engine = create_engine(database_url, pool_pre_ping=True)
+engine = get_engine(database_url)
 SessionLocal = sessionmaker(bind=engine)
 
 
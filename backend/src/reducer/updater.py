@@ -5,6 +5,7 @@ from shared.models import (
     CreateGlobalStateEntity,
 )
 from reducer.rules import logic as rules_logic
+from operator import attrgetter
 from typing import List
 
 
@@ -14,38 +15,8 @@ def apply_event(
     rules_config: RulesConfig,
     rules_hash: str,
 ) -> CreateGlobalStateEntity:
-
-    if state.updated_at_ms == 0:
-        dt_sec = None
-    else:
-        # Raw delta in milliseconds
-        dt_ms = event.timestamp_ms - state.updated_at_ms
-
-        # Avoid divide-by-zero or negative values (clock drift or out-of-order msg)
-        dt_ms = max(dt_ms, 1)  # at least 1 ms
-        dt_sec = dt_ms / 1000.0  # convert to seconds
-
-    new_state_counter = state.counter + 1
-
-    new_entropy = rules_logic.update_entropy(state.entropy, dt_sec, rules_config)
-    new_phase = rules_logic.transition_phase(new_entropy, rules_config)
-    new_countdown = rules_logic.compute_cooldown_ms(
-        new_phase, new_entropy, rules_config
-    )
-    new_reveal = rules_logic.compute_reveal_until_ms(
-        state.reveal_until_ms, event.timestamp_ms, new_phase, rules_config
-    )
-
-    return CreateGlobalStateEntity(
-        last_applied_offset=event.offset,
-        updated_at_ms=event.timestamp_ms,
-        ruleshash=rules_hash,
-        counter=new_state_counter,
-        phase=new_phase.value,  # Convert Phases enum to int
-        entropy=new_entropy,
-        reveal_until_ms=new_reveal,
-        cooldown_ms=new_countdown,
-    )
+    """Apply a single event; a one-element `apply_batch`."""
+    return apply_batch(state, [event], rules_config, rules_hash)
 
 
 def apply_batch(
@@ -54,8 +25,37 @@ def apply_batch(
     rules_config: RulesConfig,
     rules_hash: str,
 ) -> CreateGlobalStateEntity:
-    new_state = state
-    for event in sorted(events, key=lambda e: e.offset):
-        new_state = apply_event(new_state, event, rules_config, rules_hash)
+    """Fold a batch of events into the state.
+
+    Entropy and the reveal window depend on every event, but counter, phase
+    and cooldown only matter for the final state, so only that one is
+    materialized. Folding a batch gives the same result as applying its
+    events one at a time.
+    """
+    if not events:
+        return state
+
+    # Every press shares API_KAFKA_GLOBAL_KEY, so a batch comes from a single
+    # partition and is normally already in offset order; timsort detects the
+    # run and finishes in one linear pass. The sort only guards against
+    # hand-built or redelivered batches.
+    ordered = sorted(events, key=attrgetter("offset"))
+
+    entropy, phase, reveal_until_ms = rules_logic.fold_events(
+        state.entropy,
+        state.updated_at_ms,
+        state.reveal_until_ms,
+        [e.timestamp_ms for e in ordered],
+        rules_config,
+    )
 
-    return new_state
+    return CreateGlobalStateEntity(
+        last_applied_offset=ordered[-1].offset,
+        updated_at_ms=ordered[-1].timestamp_ms,
+        ruleshash=rules_hash,
+        counter=state.counter + len(ordered),
+        phase=phase.value,  # Convert Phases enum to int
+        entropy=entropy,
+        reveal_until_ms=reveal_until_ms,
+        cooldown_ms=rules_logic.compute_cooldown_ms(phase, entropy, rules_config),
+    )
@@ -21,18 +21,54 @@ Usage:
 
 import asyncio
 import argparse
+import itertools
+import os
 import time
 import json
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import httpx
 import hashlib
 
 
-@dataclass
+def _solve_pow_sync(challenge_id: str, difficulty: int) -> int:
+    """
+    Find the first nonce whose hash has `difficulty` leading hex zeros.
+
+    The "<challenge_id>:" prefix is hashed once and its SHA256 state is
+    copied per nonce, so each attempt only hashes the nonce digits. The
+    check runs on the raw digest: N leading hex zeros == N // 2 zero bytes,
+    plus a zero high nibble on the next byte when N is odd. This is
+    CPU-bound and meant to run off the event loop via asyncio.to_thread.
+
+    Returns:
+        The first solving nonce
+    """
+    base = hashlib.sha256(f"{challenge_id}:".encode())
+    if difficulty > 2 * base.digest_size:
+        raise ValueError(f"difficulty {difficulty} exceeds SHA256 digest length")
+
+    zero_bytes, odd_nibble = divmod(difficulty, 2)
+    zeros = b"\x00" * zero_bytes
+
+    for nonce in itertools.count():
+        h = base.copy()
+        h.update(str(nonce).encode())
+        digest = h.digest()
+        if digest[:zero_bytes] == zeros and (
+            not odd_nibble or digest[zero_bytes] < 0x10
+        ):
+            return nonce
+
+
+@dataclass(slots=True)
 class TestStats:
-    """Statistics for load test run."""
+    """Statistics for load test run.
+
+    Only mutated from the event loop thread, so counters need no locking.
+    """
     total_requests: int = 0
     successful: int = 0
     failed: int = 0
@@ -92,8 +128,11 @@ class LoadTester:
         self.bypass_pow = bypass_pow
         self.rate_limit = rate_limit
         self.stats = TestStats()
-        self.semaphore: Optional[asyncio.Semaphore] = None
-        self.rate_limiter: Optional[asyncio.Semaphore] = None
+        # Token bucket for rate limiting (burst of up to one second of requests)
+        self._bucket_capacity = max(rate_limit or 0.0, 1.0)
+        self._tokens = self._bucket_capacity
+        self._last_refill = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
 
     async def solve_pow_challenge(self, challenge: Dict) -> str:
         """
@@ -105,24 +144,12 @@ class LoadTester:
         Returns:
             Nonce string that solves the challenge
         """
-        challenge_id = challenge["challenge_id"]
-        difficulty = challenge["difficulty"]
-        target = "0" * difficulty
-
-        nonce = 0
-        while True:
-            nonce_str = str(nonce)
-            payload = f"{challenge_id}:{nonce_str}".encode()
-            hash_result = hashlib.sha256(payload).hexdigest()
-
-            if hash_result.startswith(target):
-                return nonce_str
-
-            nonce += 1
-
-            # Yield occasionally to avoid blocking
-            if nonce % 1000 == 0:
-                await asyncio.sleep(0)
+        # Mine on a worker thread so the event loop keeps serving other
+        # requests' network I/O in the meantime
+        nonce = await asyncio.to_thread(
+            _solve_pow_sync, challenge["challenge_id"], challenge["difficulty"]
+        )
+        return str(nonce)
 
     async def fetch_challenge(self, client: httpx.AsyncClient) -> Dict:
         """Fetch a PoW challenge from the API."""
@@ -130,6 +157,22 @@ class LoadTester:
         response.raise_for_status()
         return response.json()
 
+    @staticmethod
+    def _press_result(response: httpx.Response) -> Dict:
+        """Build a press result, only decoding the body when it's reported."""
+        status = response.status_code
+        data = {}
+        # Successful and rate-limited presses are only counted, so skip the
+        # JSON decode on the hot path
+        if status not in (202, 429) and response.headers.get(
+            "content-type", ""
+        ).startswith("application/json"):
+            data = response.json()
+        return {
+            "status": status,
+            "data": data,
+        }
+
     async def send_button_press(
         self, client: httpx.AsyncClient, challenge: Dict, nonce: str
     ) -> Dict:
@@ -146,11 +189,7 @@ class LoadTester:
             f"{self.api_url}/v1/events/press",
             json=body,
         )
-        data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-        return {
-            "status": response.status_code,
-            "data": data,
-        }
+        return self._press_result(response)
 
     async def send_press_with_bypass(
         self, client: httpx.AsyncClient
@@ -168,24 +207,25 @@ class LoadTester:
             f"{self.api_url}/v1/events/press",
             json=body,
         )
-        data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-        return {
-            "status": response.status_code,
-            "data": data,
-        }
+        return self._press_result(response)
 
     async def rate_limiter_wait(self):
-        """Wait if rate limiting is enabled."""
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
-            # Release after 1 second to allow next request
-            asyncio.create_task(self._release_rate_limiter_after_delay())
-
-    async def _release_rate_limiter_after_delay(self):
-        """Release rate limiter after 1 second."""
-        await asyncio.sleep(1.0 / self.rate_limit if self.rate_limit else 1.0)
-        if self.rate_limiter:
-            self.rate_limiter.release()
+        """Wait for a token from the rate limit bucket (refilled continuously)."""
+        while True:
+            async with self._bucket_lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._bucket_capacity,
+                    self._tokens + (now - self._last_refill) * self.rate_limit,
+                )
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate_limit
+
+            # Sleep outside the lock so other requests can check the bucket
+            await asyncio.sleep(wait)
 
     async def single_request(self, client: httpx.AsyncClient, request_id: int):
         """Execute a single button press request."""
@@ -217,7 +257,9 @@ class LoadTester:
                 self.stats.rate_limited += 1
             else:
                 self.stats.failed += 1
-                print(f"Request {request_id}: Failed with status {status}")
+                print(
+                    f"Request {request_id}: Failed with status {status} {result['data']}"
+                )
 
         except Exception as e:
             self.stats.total_requests += 1
@@ -237,11 +279,17 @@ class LoadTester:
             progress_interval: Print progress every N requests
         """
         self.stats.start_time = time.time()
-        self.semaphore = asyncio.Semaphore(concurrent)
+
+        # PoW solving runs via asyncio.to_thread; size its pool to the machine
+        # rather than the interpreter's default
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=os.cpu_count())
+        )
 
         if self.rate_limit:
-            # Create semaphore for rate limiting
-            self.rate_limiter = asyncio.Semaphore(int(self.rate_limit))
+            # Start the run with a full bucket
+            self._tokens = self._bucket_capacity
+            self._last_refill = time.monotonic()
 
         print(f"\n{'='*60}")
         print(f"Load Test Starting")
@@ -254,10 +302,12 @@ class LoadTester:
             print(f"Rate Limit: {self.rate_limit} req/s")
         print(f"{'='*60}\n")
 
-        async def bounded_request(request_id: int):
-            async with self.semaphore:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    await self.single_request(client, request_id)
+        # Shared across workers; each pulls the next request id when free
+        request_ids = iter(range(total_requests))
+
+        async def worker(client: httpx.AsyncClient):
+            for request_id in request_ids:
+                await self.single_request(client, request_id)
 
                 # Print progress
                 if (request_id + 1) % progress_interval == 0:
@@ -270,11 +320,18 @@ class LoadTester:
                         f"{self.stats.rate_limited} rate limited)"
                     )
 
-        # Create all tasks
-        tasks = [bounded_request(i) for i in range(total_requests)]
-
-        # Run all tasks
-        await asyncio.gather(*tasks)
+        # One client for the whole run so keep-alive connections are reused,
+        # with the pool sized to the number of workers
+        limits = httpx.Limits(
+            max_connections=concurrent, max_keepalive_connections=concurrent
+        )
+        timeout = httpx.Timeout(30.0, connect=5.0)
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            # A fixed pool of workers bounds concurrency without creating a
+            # task per request up front
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(concurrent):
+                    tg.create_task(worker(client))
 
         self.stats.end_time = time.time()
 
@@ -293,7 +350,10 @@ class LoadTester:
         print(f"Avg Response Time: {self.stats.avg_response_time:.2f} ms")
 
         if self.stats.response_times:
-            sorted_times = sorted(self.stats.response_times)
+            # Sort in place: arrival order isn't needed once the run is over,
+            # and this avoids copying a list that grows with --requests
+            sorted_times = self.stats.response_times
+            sorted_times.sort()
             p50 = sorted_times[len(sorted_times) // 2]
             p95 = sorted_times[int(len(sorted_times) * 0.95)]
             p99 = sorted_times[int(len(sorted_times) * 0.99)]
@@ -369,5 +429,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is only installed where it is supported (see pyproject.toml);
+    # fall back to the stdlib loop elsewhere, e.g. on Windows
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
@@ -14,6 +14,7 @@ import os
 import sys
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
@@ -46,8 +47,7 @@ def load_rules_file(file_path: str) -> dict:
     if not path.exists():
         raise FileNotFoundError(f"Rules file not found: {file_path}")
 
-    with open(path) as f:
-        rules_dict = json.load(f)
+    rules_dict = orjson.loads(path.read_bytes())
 
     # Validate by attempting to create RulesConfig
     try:
@@ -60,7 +60,9 @@ def load_rules_file(file_path: str) -> dict:
 
 def compute_rules_hash(rules_dict: dict) -> str:
     """Compute a deterministic hash of the rules."""
-    # Sort keys for deterministic serialization
+    # Sort keys for deterministic serialization. Stays on json.dumps: hashes
+    # are persisted as ruleset identities, and orjson's compact separators
+    # would give every existing ruleset a new hash.
     rules_json = json.dumps(rules_dict, sort_keys=True)
     return hashlib.sha256(rules_json.encode()).hexdigest()[:16]
 
@@ -0,0 +1,74 @@
+"""
+Shared database engine factory.
+
+Modules that talk to the database get their engine from here instead of
+calling create_engine themselves, so every module in a process shares one
+connection pool sized for how that process runs:
+
+- "service": long-lived processes (API, reducer, watcher loop) keep a
+  fixed QueuePool of DB_POOL_SIZE connections.
+- "lambda": short-lived invocations use NullPool and open one connection
+  per checkout, so nothing is left dangling across freezes.
+"""
+
+import os
+from functools import lru_cache
+from typing import Literal, Optional
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.pool import NullPool
+
+EngineMode = Literal["service", "lambda"]
+
+DEFAULT_POOL_SIZE = 20
+POOL_RECYCLE_SECONDS = 300
+
+
+def get_database_url() -> str:
+    """
+    Read DATABASE_URL, which every service sets.
+
+    Raises:
+        ValueError: If DATABASE_URL is not set
+    """
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable is required")
+    return database_url
+
+
+def _default_mode() -> EngineMode:
+    # Set by the AWS Lambda runtime in every invocation environment
+    return "lambda" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "service"
+
+
+@lru_cache(maxsize=None)
+def _create_engine(database_url: str, mode: EngineMode) -> Engine:
+    if mode == "lambda":
+        return create_engine(database_url, poolclass=NullPool)
+
+    # SQLite (tests, local tooling) picks its own pool class, which does not
+    # accept QueuePool sizing arguments
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return create_engine(database_url, pool_pre_ping=True)
+
+    return create_engine(
+        database_url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        max_overflow=0,
+        pool_pre_ping=True,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+    )
+
+
+def get_engine(database_url: str, mode: Optional[EngineMode] = None) -> Engine:
+    """
+    Get the process-wide engine for a database URL.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        mode: "service" or "lambda"; detected from the environment if omitted
+
+    Returns:
+        Engine shared by every caller with the same URL and mode
+    """
+    return _create_engine(database_url, mode or _default_mode())
@@ -30,15 +30,23 @@ def send_message(
     key: Optional[str] = None,
     topic: str = constants.API_KAFKA_TOPIC,
 ) -> None:
-    """Send a message to Kafka."""
+    """Queue a message for Kafka.
+
+    Does not poll, so librdkafka can batch consecutive sends; call
+    `drain_producer` (or `flush_producer`) once per batch to serve
+    delivery callbacks.
+    """
     producer.produce(
         topic=topic,
         key=key.encode("utf-8") if key else None,
         value=json.dumps(value).encode("utf-8"),
         callback=delivery_callback,
     )
-    # Trigger delivery callbacks
-    producer.poll(0)
+
+
+def drain_producer(producer: Producer, timeout: float = 0.0) -> int:
+    """Serve delivery callbacks for queued messages. Returns events processed."""
+    return producer.poll(timeout)
 
 
 def flush_producer(producer: Producer, timeout: float = 10.0) -> int:
@@ -20,7 +20,7 @@ class Phases(Enum):
     CHAOS = 3
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CreateGlobalStateEntity:
     last_applied_offset: int
     updated_at_ms: int
@@ -32,7 +32,7 @@ class CreateGlobalStateEntity:
     cooldown_ms: Optional[int]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GlobalStateEntity(CreateGlobalStateEntity):
     id: int
 
@@ -75,7 +75,7 @@ class RulesetEntity(CreateRulesetEntity):
     id: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PressEvent:
     offset: int
     timestamp_ms: int
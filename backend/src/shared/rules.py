@@ -4,37 +4,85 @@ Shared rules retriever - provides access to rulesets for all services.
 This module allows reducer, watcher, and other services to retrieve rules
 consistently without creating cross-dependencies.
 """
-import os
-from sqlalchemy import create_engine, select
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
+from shared.db import get_database_url, get_engine
 from shared.models import Ruleset, RulesConfig, RulesetEntity
-from typing import Tuple
+from typing import Optional, Tuple
 
-# Get database URL from environment (all services have DATABASE_URL)
-database_url = os.getenv("DATABASE_URL")
-if not database_url:
-    raise ValueError("DATABASE_URL environment variable is required")
 
-engine = create_engine(database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine)
+@lru_cache(maxsize=1)
+def _session_local() -> sessionmaker:
+    """Build the session factory on first use, so importing stays cheap."""
+    return sessionmaker(bind=get_engine(get_database_url()))
+
+
+# Rulesets are immutable per hash, so each one is converted once per process
+# and shared by every service reading it. Values must not be mutated.
+RULES_CACHE_SIZE = 64
+_rules_cache: OrderedDict[str, Tuple[RulesetEntity, RulesConfig]] = OrderedDict()
+_rules_cache_lock = threading.Lock()
+
+
+def get_cached_rules(rules_hash: str) -> Optional[Tuple[RulesetEntity, RulesConfig]]:
+    """Return the cached rules for a hash, or None if not cached."""
+    with _rules_cache_lock:
+        cached = _rules_cache.get(rules_hash)
+        if cached is not None:
+            _rules_cache.move_to_end(rules_hash)
+        return cached
+
+
+def cached_rules_hashes() -> list[str]:
+    """Hashes currently held in the rules cache."""
+    with _rules_cache_lock:
+        return list(_rules_cache)
+
+
+def cache_rules(selected_rules: Ruleset) -> Tuple[RulesetEntity, RulesConfig]:
+    """Convert a Ruleset row and store it in the rules cache.
+
+    Must be called while the row's session is still open. Evicts the least
+    recently used entry once RULES_CACHE_SIZE is exceeded.
+    """
+    rules_config = RulesConfig(**selected_rules.ruleset)
+    rules_entity = RulesetEntity(
+        id=selected_rules.id,
+        version=selected_rules.version,
+        hash=selected_rules.hash,
+        ruleset=selected_rules.ruleset,
+    )
+    rules = (rules_entity, rules_config)
+    with _rules_cache_lock:
+        _rules_cache[rules_entity.hash] = rules
+        _rules_cache.move_to_end(rules_entity.hash)
+        if len(_rules_cache) > RULES_CACHE_SIZE:
+            _rules_cache.popitem(last=False)
+    return rules
+
+
+def clear_rules_cache() -> None:
+    """Drop all cached rulesets."""
+    with _rules_cache_lock:
+        _rules_cache.clear()
 
 
 def get_latest_rules() -> Tuple[RulesetEntity, RulesConfig]:
-    """Get the latest ruleset from the database."""
-    with SessionLocal.begin() as db:
-        stmt = select(Ruleset).order_by(Ruleset.id.desc()).limit(1)
-        selected_rules: Ruleset | None = db.execute(stmt).scalars().first()
-        if selected_rules is None:
-            raise LookupError("No ruleset found")
+    """Get the latest ruleset from the database.
 
-        rules_config = RulesConfig(**selected_rules.ruleset)
-        rules_entity = RulesetEntity(
-            id=selected_rules.id,
-            version=selected_rules.version,
-            hash=selected_rules.hash,
-            ruleset=selected_rules.ruleset,
-        )
-        return rules_entity, rules_config
+    Only the latest hash is queried; the ruleset itself comes from the
+    per-hash cache in `get_rules_by_hash`.
+    """
+    with _session_local().begin() as db:
+        stmt = select(Ruleset.hash).order_by(Ruleset.id.desc()).limit(1)
+        latest_hash: str | None = db.execute(stmt).scalar()
+    if latest_hash is None:
+        raise LookupError("No ruleset found")
+
+    return get_rules_by_hash(latest_hash)
 
 
 def get_rules_by_hash(rules_hash: str) -> Tuple[RulesetEntity, RulesConfig]:
@@ -42,6 +90,10 @@ def get_rules_by_hash(rules_hash: str) -> Tuple[RulesetEntity, RulesConfig]:
     
     This ensures that services use the exact rules version that was used
     to compute a given state, preventing inconsistencies when rules are updated.
+
+    Results come from the shared rules cache when present; the returned
+    objects are shared and must not be mutated. Call `clear_rules_cache()`
+    to drop them.
     
     Args:
         rules_hash: The hash of the ruleset to retrieve
@@ -52,20 +104,17 @@ def get_rules_by_hash(rules_hash: str) -> Tuple[RulesetEntity, RulesConfig]:
     Raises:
         LookupError: If no ruleset with the given hash is found
     """
-    with SessionLocal.begin() as db:
+    cached = get_cached_rules(rules_hash)
+    if cached is not None:
+        return cached
+
+    with _session_local().begin() as db:
         stmt = select(Ruleset).where(Ruleset.hash == rules_hash).limit(1)
         selected_rules: Ruleset | None = db.execute(stmt).scalars().first()
         if selected_rules is None:
             raise LookupError(f"No ruleset found with hash: {rules_hash}")
 
-        rules_config = RulesConfig(**selected_rules.ruleset)
-        rules_entity = RulesetEntity(
-            id=selected_rules.id,
-            version=selected_rules.version,
-            hash=selected_rules.hash,
-            ruleset=selected_rules.ruleset,
-        )
-        return rules_entity, rules_config
+        return cache_rules(selected_rules)
 
 
 def get_rules_version(version: int) -> RulesetEntity:
@@ -1,52 +1,116 @@
-from sqlalchemy import create_engine, select
+from functools import lru_cache
+from sqlalchemy import Row, and_, select
 from sqlalchemy.orm import sessionmaker
-from shared.models import GlobalState
-from api.config import settings
-from typing import Any
+from shared.db import get_database_url, get_engine
+from shared.models import GlobalState, Ruleset, RulesConfig, RulesetEntity
+from shared.rules import (
+    cache_rules,
+    cached_rules_hashes,
+    get_cached_rules,
+    get_rules_by_hash,
+)
+from typing import Any, Tuple
 
-database_url = settings.database_url
 
-engine = create_engine(database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine)
+@lru_cache(maxsize=1)
+def _session_local() -> sessionmaker:
+    """Build the session factory on first use, so importing stays cheap."""
+    return sessionmaker(bind=get_engine(get_database_url()))
 
 
-def _orm_to_dict(orm_obj: GlobalState) -> dict[str, Any]:
-    """Convert a GlobalState ORM object to a dictionary for API response."""
-    return {
-        "id": orm_obj.id,
-        "last_applied_offset": orm_obj.last_applied_offset,
-        "updated_at_ms": orm_obj.updated_at_ms,
-        "counter": orm_obj.counter,
-        "phase": orm_obj.phase,
-        "entropy": orm_obj.entropy,
-        "reveal_until_ms": orm_obj.reveal_until_ms,
-        "cooldown_ms": orm_obj.cooldown_ms,
-        "ruleshash": orm_obj.ruleshash,
-        "created_at": orm_obj.created_at.isoformat() if orm_obj.created_at else None,
-    }
+# Selected as plain columns so reads skip ORM entity hydration
+_STATE_COLUMNS = (
+    GlobalState.id,
+    GlobalState.last_applied_offset,
+    GlobalState.updated_at_ms,
+    GlobalState.counter,
+    GlobalState.phase,
+    GlobalState.entropy,
+    GlobalState.reveal_until_ms,
+    GlobalState.cooldown_ms,
+    GlobalState.ruleshash,
+    GlobalState.created_at,
+)
+
+
+def _row_to_dict(row: Row) -> dict[str, Any]:
+    """Convert a selected GlobalState row to a dictionary for API response."""
+    state = dict(row._mapping)
+    created_at = state["created_at"]
+    state["created_at"] = created_at.isoformat() if created_at else None
+    return state
 
 
 def get_latest_state() -> dict[str, Any]:
-    with SessionLocal.begin() as db:
+    with _session_local().begin() as db:
 
-        stmt = select(GlobalState).order_by(GlobalState.id.desc()).limit(1)
-        selected_state: GlobalState | None = db.execute(stmt).scalars().first()
+        stmt = select(*_STATE_COLUMNS).order_by(GlobalState.id.desc()).limit(1)
+        selected_state: Row | None = db.execute(stmt).first()
         if selected_state is None:
             raise LookupError("No global state found")
 
-        return _orm_to_dict(selected_state)
+        return _row_to_dict(selected_state)
 
 
 def get_state_by_id(id: int) -> dict[str, Any]:
-    with SessionLocal.begin() as db:
+    with _session_local().begin() as db:
         stmt = (
-            select(GlobalState)
+            select(*_STATE_COLUMNS)
             .where(GlobalState.id == id)
             .order_by(GlobalState.id.desc())
             .limit(1)
         )
-        selected_state: GlobalState | None = db.execute(stmt).scalars().first()
+        selected_state: Row | None = db.execute(stmt).first()
         if selected_state is None:
             raise LookupError("No global state found")
 
-        return _orm_to_dict(selected_state)
+        return _row_to_dict(selected_state)
+
+
+def get_latest_state_with_rules() -> Tuple[dict[str, Any], RulesetEntity, RulesConfig]:
+    """Get the latest state together with the ruleset that produced it.
+
+    State and rules are read in one select, so both come from the same
+    transaction in a single round trip. The ruleset is only joined in when
+    its hash is not already in the shared rules cache (see shared.rules);
+    if that entry is evicted before it is read, the ruleset is fetched by
+    hash instead.
+
+    Returns:
+        Tuple of (state dict, RulesetEntity, RulesConfig)
+
+    Raises:
+        LookupError: If no state exists or its ruleshash has no ruleset
+    """
+    with _session_local().begin() as db:
+        stmt = (
+            select(*_STATE_COLUMNS, Ruleset)
+            .outerjoin(
+                Ruleset,
+                and_(
+                    Ruleset.hash == GlobalState.ruleshash,
+                    Ruleset.hash.not_in(cached_rules_hashes()),
+                ),
+            )
+            .order_by(GlobalState.id.desc())
+            .limit(1)
+        )
+        selected: Row | None = db.execute(stmt).first()
+        if selected is None:
+            raise LookupError("No global state found")
+
+        state = _row_to_dict(selected)
+        # The joined Ruleset entity rides along in the row under its class name
+        selected_rules: Ruleset | None = state.pop(Ruleset.__name__)
+        ruleshash = state["ruleshash"]
+        if selected_rules is not None:
+            rules = cache_rules(selected_rules)
+        else:
+            rules = get_cached_rules(ruleshash)
+
+    if rules is None:
+        # Evicted between the query and the lookup; raises if truly missing
+        rules = get_rules_by_hash(ruleshash)
+
+    rules_entity, rules_config = rules
+    return state, rules_entity, rules_config
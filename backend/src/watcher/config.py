@@ -53,9 +53,11 @@ class WatcherSettings(BaseSettings):
                 "sasl.mechanism": "PLAIN",
                 "sasl.username": self.kafka_api_key,
                 "sasl.password": self.kafka_api_secret,
-                "acks": "1",
+                "acks": "all",  # Required by enable.idempotence
                 "enable.idempotence": True,  # Prevent duplicates
-                "compression.type": "snappy",  # Optimize bandwidth
+                "compression.type": "lz4",  # Cheaper to compress than snappy
+                # The watcher sends at most one message per run, so the linger
+                # only delays that send by 10ms; it is not latency critical
                 "linger.ms": 10,  # Improved batching throughput
                 "client.id": self.kafka_client_id,
             }
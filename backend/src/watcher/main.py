@@ -6,8 +6,7 @@ allowing the system to automatically reduce entropy and transition phases.
 """
 import logging
 import signal
-import sys
-import time
+import threading
 from watcher.watcher_lambda import watcher_lambda
 from watcher.config import settings
 
@@ -19,15 +18,14 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
-# Global flag for graceful shutdown
-shutdown = False
+# Set on SIGINT/SIGTERM; waiting on it lets shutdown interrupt the interval
+shutdown = threading.Event()
 
 
 def signal_handler(sig, frame):
     """Handle shutdown signals gracefully."""
-    global shutdown
     logger.info("Received shutdown signal, shutting down gracefully...")
-    shutdown = True
+    shutdown.set()
 
 
 def main():
@@ -43,19 +41,16 @@ def main():
     logger.info(f"Environment: {settings.env}")
 
     try:
-        while not shutdown:
+        while not shutdown.is_set():
             try:
-                result = watcher_lambda({}, None)
+                result = watcher_lambda()
                 logger.debug(f"Watcher execution result: {result}")
             except Exception as e:
                 logger.error(f"Error executing watcher_lambda: {e}", exc_info=True)
                 # Continue running even if one execution fails
 
-            # Sleep until next execution, checking for shutdown periodically
-            for _ in range(interval):
-                if shutdown:
-                    break
-                time.sleep(1)
+            # Sleep until next execution, waking immediately on shutdown
+            shutdown.wait(interval)
 
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
@@ -1,19 +1,68 @@
+import atexit
 import logging
 import time
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import shared.constants as constants
-from shared.kafka import create_producer, send_message
-from shared.state import get_latest_state
-from shared.rules import get_rules_by_hash
-from shared.models import Phases
+from shared.kafka import (
+    Producer,
+    create_producer,
+    send_message,
+    drain_producer,
+    flush_producer,
+)
+from shared.state import get_latest_state_with_rules
+from shared.models import Phases, RulesConfig
+from shared.rules import RULES_CACHE_SIZE
 from watcher.config import settings
 import uuid
 
 logger = logging.getLogger(__name__)
 
-PRODUCER = create_producer(settings.kafka_config)
+# Created on the first send rather than at import, so cold starts and runs
+# with nothing to transition never open a broker connection
+PRODUCER: Optional[Producer] = None
 
-def watcher_lambda(event, context):
+SHUTDOWN_FLUSH_TIMEOUT_SEC = 2.0
+
+
+def _get_producer() -> Producer:
+    global PRODUCER
+    if PRODUCER is None:
+        PRODUCER = create_producer(settings.kafka_config)
+        # Sends are only polled, never flushed per invocation; give anything
+        # still queued a bounded chance to reach the broker at process exit
+        atexit.register(flush_producer, PRODUCER, SHUTDOWN_FLUSH_TIMEOUT_SEC)
+    return PRODUCER
+
+
+PhaseCooldowns = Tuple[int, Tuple[Optional[Tuple[str, int]], ...]]
+
+
+# Rules are immutable per ruleshash, so each hash's cooldowns are derived once;
+# bounded like the shared rules cache so a long-lived process can't grow it
+@lru_cache(maxsize=RULES_CACHE_SIZE)
+def _phase_cooldowns(ruleshash: str, rules_config: RulesConfig) -> PhaseCooldowns:
+    """Shortest cooldown of any phase, plus (phase name, cooldown ms) per
+    phase value, or None where the phase never transitions down. HOT shares
+    the CHAOS cooldown."""
+    return (
+        min(
+            rules_config.cooldown_calm_ms,
+            rules_config.cooldown_warm_ms,
+            rules_config.cooldown_chaos_ms,
+        ),
+        (
+            None,
+            (Phases.WARM.name, rules_config.cooldown_warm_ms),
+            (Phases.HOT.name, rules_config.cooldown_chaos_ms),
+            (Phases.CHAOS.name, rules_config.cooldown_chaos_ms),
+        ),
+    )
+
+
+def watcher_lambda(event=None, context=None):
     """This will update the state when no button presses occur, mainly checks for
     reductions in entropy in order to drop the phase down to a lower one without
     another user needing to click the button.
@@ -21,53 +70,45 @@ def watcher_lambda(event, context):
     Uses the rules version that matches the state's ruleshash to ensure consistency
     with the reducer that computed the current state.
     """
-    state = get_latest_state()
-    
-    # Get rules matching the state's ruleshash to ensure consistency
-    # This prevents race conditions if rules are updated while watcher is running
-    _, rules_config = get_rules_by_hash(state["ruleshash"])
+    # State and the rules matching its ruleshash are read together so they
+    # are consistent even if rules are updated while the watcher is running
+    state, _, rules_config = get_latest_state_with_rules()
 
-    timestamp_ms = int(time.time() * 1000)
+    timestamp_ms = time.time_ns() // 1_000_000
 
     age = timestamp_ms - state["updated_at_ms"]
-    current_phase = state["phase"]
+    min_cooldown_ms, cooldowns = _phase_cooldowns(state["ruleshash"], rules_config)
+
+    # Common case: the button was pressed recently, so no phase can be due
+    if age < min_cooldown_ms:
+        return {"success": True}
 
-    # Check cooldown for each phase and transition down if cooldown expired
     # Phase is stored as integer: 0=CALM, 1=WARM, 2=HOT, 3=CHAOS
-    should_transition = False
-    phase_name = "UNKNOWN"
-
-    if current_phase == Phases.CHAOS.value:
-        # CHAOS -> transition down if cooldown_chaos_ms expired
-        if age >= rules_config.cooldown_chaos_ms:
-            should_transition = True
-            phase_name = "CHAOS"
-    elif current_phase == Phases.HOT.value:
-        # HOT -> transition down if cooldown_chaos_ms expired (HOT uses same cooldown as CHAOS)
-        if age >= rules_config.cooldown_chaos_ms:
-            should_transition = True
-            phase_name = "HOT"
-    elif current_phase == Phases.WARM.value:
-        # WARM -> transition down if cooldown_warm_ms expired
-        if age >= rules_config.cooldown_warm_ms:
-            should_transition = True
-            phase_name = "WARM"
-    elif current_phase != Phases.CALM.value:
-        # Any other non-CALM phase -> transition to CALM if cooldown_calm_ms expired
-        if age >= rules_config.cooldown_calm_ms:
-            should_transition = True
-            phase_name = f"PHASE_{current_phase}"
+    # CALM never transitions; any unknown phase falls back to the CALM cooldown
+    current_phase = state["phase"]
+    if 0 <= current_phase < len(cooldowns):
+        entry = cooldowns[current_phase]
+    else:
+        entry = (f"PHASE_{current_phase}", rules_config.cooldown_calm_ms)
+
+    should_transition = entry is not None and age >= entry[1]
 
     if should_transition:
         payload = {
             "timestamp_ms": timestamp_ms,
-            "request_id": f"phase_transition:{timestamp_ms // 60}",
+            # Stable per phase and second, so a retried or repeated send of the
+            # same transition carries the same id
+            "request_id": f"phase_transition:{current_phase}:{timestamp_ms // 1000}",
         }
 
-        send_message(PRODUCER, value=payload, key=constants.API_KAFKA_GLOBAL_KEY)
+        producer = _get_producer()
+        send_message(producer, value=payload, key=constants.API_KAFKA_GLOBAL_KEY)
+        drain_producer(producer)
+        # %-style args so the message is only formatted if the record is emitted
         logger.info(
-            f"Sent phase transition message for {phase_name} phase "
-            f"(age={age}ms, cooldown expired)"
+            "Sent phase transition message for %s phase (age=%dms, cooldown expired)",
+            entry[0],
+            age,
         )
 
     return {"success": True}
@@ -75,4 +116,4 @@ def watcher_lambda(event, context):
 
 if __name__ == "__main__":
     logger.info("Watcher lambda started")
-    logger.info(watcher_lambda({}, None))
\ No newline at end of file
+    logger.info(watcher_lambda())
\ No newline at end of file
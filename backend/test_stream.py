@@ -13,8 +13,11 @@ import argparse
 import requests
 import sys
 import json
+import orjson
 from datetime import datetime
 
+HEARTBEAT_EVERY_EVENTS = 1000
+
 
 def stream_states(url: str, timeout: int = 60):
     """Connect to the SSE stream and print events as they arrive."""
@@ -37,23 +40,28 @@ def stream_states(url: str, timeout: int = 60):
         print("✓ Connected to stream successfully")
         print("Listening for updates...\n")
         
-        # Process SSE stream
-        buffer = ""
-        line_count = 0
-        for line in response.iter_lines(decode_unicode=True):
-            line_count += 1
-            # Print a heartbeat every 30 seconds to show we're still connected
-            if line_count % 1000 == 0:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Still listening... (received {line_count} lines)")
-            
-            if not line:
-                # Empty line indicates end of event
-                if buffer:
-                    process_event(buffer)
-                    buffer = ""
-                continue
-            
-            buffer += line + "\n"
+        # Process SSE stream as raw bytes: events are split on the blank line
+        # that ends them with bytearray.find, and only whole events are decoded
+        buffer = bytearray()
+        event_count = 0
+        next_heartbeat = HEARTBEAT_EVERY_EVENTS
+        for chunk in response.iter_content(chunk_size=None):
+            buffer += chunk
+            start = 0
+            while (end := buffer.find(b"\n\n", start)) != -1:
+                event = buffer[start:end].strip()
+                start = end + 2
+                if not event:
+                    continue
+
+                process_event(event.decode())
+                event_count += 1
+                # Print a heartbeat every 1000 events to show we're still connected
+                if event_count >= next_heartbeat:
+                    next_heartbeat += HEARTBEAT_EVERY_EVENTS
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Still listening... (received {event_count} events)")
+
+            del buffer[:start]
             
     except KeyboardInterrupt:
         print("\n\nStream interrupted by user")
@@ -77,8 +85,8 @@ def process_event(event_text: str):
         elif line.startswith("data:"):
             data_str = line[5:].strip()
             try:
-                data = json.loads(data_str)
-            except json.JSONDecodeError:
+                data = orjson.loads(data_str)
+            except orjson.JSONDecodeError:
                 data = data_str
     
     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
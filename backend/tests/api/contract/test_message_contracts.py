@@ -85,6 +85,12 @@ class TestPressEventMessageContract:
         errors = exc_info.value.errors()
         assert any("request_id" in str(e) for e in errors)
 
+    @pytest.mark.parametrize("request_id", ["abc", "ab cd", " abcd", "0xabcd"])
+    def test_rejects_malformed_hex_request_id(self, request_id):
+        """Should reject odd-length, whitespace-separated or prefixed hex."""
+        with pytest.raises(ValidationError):
+            PressEventMessage(timestamp_ms=1704067200000, request_id=request_id)
+
     def test_round_trip_serialization(self):
         """Should survive JSON round-trip."""
         original = PressEventMessage(
@@ -258,6 +264,16 @@ class TestHealthStatusContract:
         assert data["checks"]["redis"]["status"] == "healthy"
         assert data["checks"]["redis"]["latency_ms"] == 1.0
 
+    def test_default_timestamp_is_current_utc(self):
+        """Should default to a timezone-aware UTC timestamp near now."""
+        from datetime import datetime, timezone
+
+        status = HealthStatus(status="healthy")
+
+        assert status.timestamp.tzinfo is not None
+        delta = datetime.now(timezone.utc) - status.timestamp
+        assert 0 <= delta.total_seconds() < 2
+
 
 class TestBackwardsCompatibility:
     """Tests to ensure backwards compatibility of contracts."""
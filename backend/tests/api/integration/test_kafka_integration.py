@@ -13,6 +13,7 @@ Requirements:
 
 import json
 import time
+import uuid
 
 from confluent_kafka import Consumer, Producer
 from confluent_kafka.admin import AdminClient, NewTopic
@@ -29,25 +30,53 @@ try:
 except Exception:
     DOCKER_AVAILABLE = False
 
-pytestmark = pytest.mark.skipif(
-    not DOCKER_AVAILABLE,
-    reason="Docker not available or not running"
-)
+pytestmark = [
+    pytest.mark.skipif(
+        not DOCKER_AVAILABLE,
+        reason="Docker not available or not running"
+    ),
+    # Keep the module on one xdist worker so it shares a single container
+    pytest.mark.xdist_group("kafka_integration"),
+]
+
+
+def _produce_and_wait(producer: Producer, timeout: float = 10.0, **kwargs):
+    """Produce one message and wait only for its own delivery report.
+
+    Returns the delivery error (None on success).
+    """
+    reports = []
+    producer.produce(callback=lambda err, msg: reports.append(err), **kwargs)
+
+    deadline = time.monotonic() + timeout
+    while not reports:
+        remaining = deadline - time.monotonic()
+        assert remaining > 0, "Timed out waiting for delivery report"
+        # Returns as soon as the delivery report is served
+        producer.poll(min(remaining, 0.1))
+
+    return reports[0]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def kafka_container():
-    """Spin up a real Kafka container for integration tests."""
+    """Spin up one real Kafka container shared by the whole test session."""
     with KafkaContainer("confluentinc/cp-kafka:7.5.0") as container:
         yield container
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def kafka_bootstrap(kafka_container):
     """Get the bootstrap server address."""
     return kafka_container.get_bootstrap_server()
 
 
+@pytest.fixture(scope="session")
+def kafka_admin(kafka_bootstrap):
+    """Admin client shared by the whole test session."""
+    return AdminClient({"bootstrap.servers": kafka_bootstrap})
+
+
 @pytest.fixture
 def kafka_producer(kafka_bootstrap):
     """Create a Kafka producer connected to the test container."""
@@ -74,48 +103,58 @@ def kafka_consumer(kafka_bootstrap):
     consumer.close()
 
 
-@pytest.fixture
-def create_test_topic(kafka_bootstrap):
-    """Factory to create test topics."""
-    admin = AdminClient({"bootstrap.servers": kafka_bootstrap})
-    created_topics = []
-
-    def _create(topic_name: str, num_partitions: int = 1):
-        topic = NewTopic(topic_name, num_partitions=num_partitions, replication_factor=1)
-        futures = admin.create_topics([topic])
-        for topic_name, future in futures.items():
-            try:
-                future.result(timeout=10)
-                created_topics.append(topic_name)
-            except Exception as e:
-                # Topic might already exist
-                pass
-        return topic_name
-
-    yield _create
+# Every topic the tests use, created together in one AdminClient request
+TEST_TOPICS = (
+    "test-produce-consume",
+    "test-press-events",
+    "test-ordering",
+    "test-callback",
+    "test-null-key",
+    "test-list-topics",
+    "test-flush",
+)
+
+
+@pytest.fixture(scope="session")
+def kafka_topics(kafka_admin):
+    """Create all test topics in a single batch; maps base name -> topic.
+
+    Names get a random suffix so reruns against a reused broker never see
+    stale messages.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    topics = {name: f"{name}-{suffix}" for name in TEST_TOPICS}
+
+    futures = kafka_admin.create_topics(
+        [NewTopic(topic, num_partitions=1, replication_factor=1) for topic in topics.values()]
+    )
+    for future in futures.values():
+        future.result(timeout=10)
+
+    yield topics
 
     # Cleanup - delete created topics
-    if created_topics:
-        admin.delete_topics(created_topics)
+    kafka_admin.delete_topics(list(topics.values()))
 
 
 class TestKafkaProducerIntegration:
     """Integration tests for Kafka producer functionality."""
 
     def test_produce_and_consume_message(
-        self, kafka_producer, kafka_consumer, create_test_topic
+        self, kafka_producer, kafka_consumer, kafka_topics
     ):
         """Should successfully produce and consume a message."""
-        topic = create_test_topic("test-produce-consume")
+        topic = kafka_topics["test-produce-consume"]
 
         # Produce a message
         message = {"id": 1, "data": "test"}
-        kafka_producer.produce(
+        err = _produce_and_wait(
+            kafka_producer,
             topic=topic,
             key=b"test-key",
             value=json.dumps(message).encode("utf-8"),
         )
-        kafka_producer.flush(timeout=10)
+        assert err is None
 
         # Consume the message
         kafka_consumer.subscribe([topic])
@@ -128,22 +167,23 @@ class TestKafkaProducerIntegration:
         assert json.loads(msg.value().decode("utf-8")) == message
 
     def test_produce_press_event_format(
-        self, kafka_producer, kafka_consumer, create_test_topic
+        self, kafka_producer, kafka_consumer, kafka_topics
     ):
         """Should correctly produce press event in expected format."""
-        topic = create_test_topic("test-press-events")
+        topic = kafka_topics["test-press-events"]
 
         # Produce a press event matching the API format
         press_event = {
             "timestamp_ms": int(time.time() * 1000),
             "request_id": "abc123def456",
         }
-        kafka_producer.produce(
+        err = _produce_and_wait(
+            kafka_producer,
             topic=topic,
             key=constants.API_KAFKA_GLOBAL_KEY.encode("utf-8"),
             value=json.dumps(press_event).encode("utf-8"),
         )
-        kafka_producer.flush(timeout=10)
+        assert err is None
 
         # Consume and verify
         kafka_consumer.subscribe([topic])
@@ -157,17 +197,20 @@ class TestKafkaProducerIntegration:
         assert msg.key().decode("utf-8") == constants.API_KAFKA_GLOBAL_KEY
 
     def test_multiple_messages_ordering(
-        self, kafka_producer, kafka_consumer, create_test_topic
+        self, kafka_producer, kafka_consumer, kafka_topics
     ):
         """Should maintain message ordering within a partition."""
-        topic = create_test_topic("test-ordering")
+        topic = kafka_topics["test-ordering"]
+
+        # Encode up front so the produce loop only exercises the producer
+        payloads = [json.dumps({"sequence": i}).encode("utf-8") for i in range(10)]
 
         # Produce multiple messages with same key (same partition)
-        for i in range(10):
+        for payload in payloads:
             kafka_producer.produce(
                 topic=topic,
                 key=b"same-key",
-                value=json.dumps({"sequence": i}).encode("utf-8"),
+                value=payload,
             )
         kafka_producer.flush(timeout=10)
 
@@ -185,10 +228,10 @@ class TestKafkaProducerIntegration:
         assert sequences == list(range(10))
 
     def test_delivery_callback_invoked(
-        self, kafka_producer, create_test_topic
+        self, kafka_producer, kafka_topics
     ):
         """Should invoke delivery callback on successful send."""
-        topic = create_test_topic("test-callback")
+        topic = kafka_topics["test-callback"]
         delivery_results = []
 
         def on_delivery(err, msg):
@@ -210,17 +253,18 @@ class TestKafkaProducerIntegration:
         assert delivery_results[0]["topic"] == topic
 
     def test_message_with_null_key(
-        self, kafka_producer, kafka_consumer, create_test_topic
+        self, kafka_producer, kafka_consumer, kafka_topics
     ):
         """Should handle messages with null keys."""
-        topic = create_test_topic("test-null-key")
+        topic = kafka_topics["test-null-key"]
 
-        kafka_producer.produce(
+        err = _produce_and_wait(
+            kafka_producer,
             topic=topic,
             key=None,
             value=b"message-without-key",
         )
-        kafka_producer.flush(timeout=10)
+        assert err is None
 
         kafka_consumer.subscribe([topic])
         msg = kafka_consumer.poll(timeout=10.0)
@@ -233,9 +277,9 @@ class TestKafkaProducerIntegration:
 class TestKafkaConnectionIntegration:
     """Integration tests for Kafka connection handling."""
 
-    def test_list_topics(self, kafka_bootstrap, create_test_topic):
+    def test_list_topics(self, kafka_bootstrap, kafka_topics):
         """Should list available topics."""
-        topic = create_test_topic("test-list-topics")
+        topic = kafka_topics["test-list-topics"]
 
         producer = Producer({"bootstrap.servers": kafka_bootstrap})
         metadata = producer.list_topics(timeout=10)
@@ -243,9 +287,9 @@ class TestKafkaConnectionIntegration:
         assert topic in metadata.topics
         producer.flush()
 
-    def test_producer_flush_returns_zero(self, kafka_producer, create_test_topic):
+    def test_producer_flush_returns_zero(self, kafka_producer, kafka_topics):
         """Should return zero remaining messages after flush."""
-        topic = create_test_topic("test-flush")
+        topic = kafka_topics["test-flush"]
 
         kafka_producer.produce(topic=topic, value=b"test")
         remaining = kafka_producer.flush(timeout=10)
@@ -7,87 +7,137 @@ These tests spin up a real Redis instance to verify:
 - Serialization/deserialization
 """
 
-import asyncio
-import json
-import time
+import orjson
 
 import pytest
+import pytest_asyncio
 import redis as redis_lib
+from redis.utils import HIREDIS_AVAILABLE
 from testcontainers.redis import RedisContainer
 
 from shared.constants import API_REDIS_STATE_UPDATE_CHANNEL
 from shared.models import PersistedGlobalState
 
+pytestmark = [
+    # redis-py silently falls back to its pure-Python parser without hiredis
+    pytest.mark.skipif(not HIREDIS_AVAILABLE, reason="hiredis not installed"),
+    # Keep the module on one xdist worker so it shares a single container
+    pytest.mark.xdist_group("redis_integration"),
+]
 
-@pytest.fixture(scope="module")
+
+@pytest.fixture(scope="session")
 def redis_container():
-    """Spin up a real Redis container for integration tests."""
+    """Spin up one real Redis container shared by the whole test session."""
     with RedisContainer("redis:7-alpine") as container:
         yield container
 
 
+@pytest.fixture(scope="session")
+def redis_address(redis_container):
+    """(host, port) of the container, resolved once via docker inspect."""
+    host = redis_container.get_container_host_ip()
+    port = int(redis_container.get_exposed_port(6379))
+    return host, port
+
+
+@pytest.fixture(scope="session")
+def redis_pool(redis_address):
+    """Connection pool shared by every sync client in the session.
+
+    Responses are left undecoded (bytes) to skip a UTF-8 decode per field.
+    """
+    host, port = redis_address
+    pool = redis_lib.ConnectionPool(
+        host=host, port=port, max_connections=16
+    )
+    yield pool
+    pool.disconnect()
+
+
 @pytest.fixture
-def redis_client(redis_container):
+def redis_client(redis_pool):
     """Create a Redis client connected to the test container."""
-    host = redis_container.get_container_host_ip()
-    port = redis_container.get_exposed_port(6379)
-    client = redis_lib.Redis(host=host, port=int(port), decode_responses=True)
+    client = redis_lib.Redis(connection_pool=redis_pool)
     yield client
     client.close()
 
 
-@pytest.fixture
-def async_redis_client(redis_container):
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_redis_pool(redis_address):
+    """Connection pool shared by every async client in the session.
+
+    Async connections belong to the loop that opened them, so the pool and
+    the tests using it run on the session-scoped event loop.
+    """
+    host, port = redis_address
+    pool = redis_lib.asyncio.ConnectionPool(
+        host=host, port=port, max_connections=8
+    )
+    yield pool
+    await pool.aclose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_redis_client(async_redis_pool):
     """Create an async Redis client connected to the test container."""
-    host = redis_container.get_container_host_ip()
-    port = redis_container.get_exposed_port(6379)
-    client = redis_lib.asyncio.Redis(host=host, port=int(port), decode_responses=True)
+    client = redis_lib.asyncio.Redis(connection_pool=async_redis_pool)
     yield client
+    # Releases the client's connection; the shared pool stays open
+    await client.aclose()
+
+
+@pytest.fixture
+def channel(request):
+    """State-update channel namespaced to the current test, as bytes.
+
+    Pub/sub is server-wide, so a subscriber left open by one test would
+    otherwise count towards or receive another test's publishes. Clients
+    keep responses as bytes, so the channel is pre-encoded to compare
+    directly against message["channel"].
+    """
+    return f"{API_REDIS_STATE_UPDATE_CHANNEL}:{request.node.name}".encode()
 
 
 def wait_for_subscription(pubsub, timeout=5.0):
-    """Wait for the subscription to be confirmed."""
-    start = time.time()
-    while time.time() - start < timeout:
-        msg = pubsub.get_message(timeout=0.1)
-        if msg and msg["type"] == "subscribe":
-            return True
-    return False
+    """Wait for the subscription to be confirmed.
+
+    The SUBSCRIBE ack is the first message on a fresh pubsub connection, so
+    a single blocking read is enough.
+    """
+    msg = pubsub.get_message(timeout=timeout)
+    return msg is not None and msg["type"] == "subscribe"
+
+
+@pytest.fixture
+def pubsub(redis_client, channel):
+    """A pubsub connection already subscribed to the test's channel."""
+    pubsub = redis_client.pubsub()
+    pubsub.subscribe(channel)
+    assert wait_for_subscription(pubsub), "Subscription not confirmed"
+    yield pubsub
+    pubsub.close()
 
 
 class TestRedisPubSubIntegration:
     """Integration tests for Redis pub/sub functionality."""
 
-    def test_publish_and_receive_message(self, redis_client):
+    def test_publish_and_receive_message(self, redis_client, pubsub, channel):
         """Should successfully publish and receive a message."""
-        pubsub = redis_client.pubsub()
-        pubsub.subscribe(API_REDIS_STATE_UPDATE_CHANNEL)
-
-        # Wait for subscription to be confirmed
-        assert wait_for_subscription(pubsub), "Subscription not confirmed"
-
         # Publish a message
         message_data = {"id": 1, "test": "data"}
-        redis_client.publish(API_REDIS_STATE_UPDATE_CHANNEL, json.dumps(message_data))
+        redis_client.publish(channel, orjson.dumps(message_data))
 
         # Receive the message (with timeout)
         message = pubsub.get_message(timeout=5.0)
 
         assert message is not None
         assert message["type"] == "message"
-        assert message["channel"] == API_REDIS_STATE_UPDATE_CHANNEL
-        assert json.loads(message["data"]) == message_data
-
-        pubsub.close()
+        assert message["channel"] == channel
+        assert orjson.loads(message["data"]) == message_data
 
-    def test_publish_state_update_format(self, redis_client):
+    def test_publish_state_update_format(self, redis_client, pubsub, channel):
         """Should correctly serialize and deserialize PersistedGlobalState."""
-        pubsub = redis_client.pubsub()
-        pubsub.subscribe(API_REDIS_STATE_UPDATE_CHANNEL)
-
-        # Wait for subscription to be confirmed
-        assert wait_for_subscription(pubsub), "Subscription not confirmed"
-
         # Create a state update matching what the reducer publishes
         state_data = {
             "type": "state_updated",
@@ -95,70 +145,55 @@ class TestRedisPubSubIntegration:
             "last_applied_offset": 100,
             "ruleshash": "abc123",
         }
-        redis_client.publish(API_REDIS_STATE_UPDATE_CHANNEL, json.dumps(state_data))
+        redis_client.publish(channel, orjson.dumps(state_data))
 
         message = pubsub.get_message(timeout=5.0)
 
         assert message is not None
-        received_data = json.loads(message["data"])
+        received_data = orjson.loads(message["data"])
         assert received_data["id"] == 42
         assert received_data["last_applied_offset"] == 100
         assert received_data["ruleshash"] == "abc123"
 
-        pubsub.close()
-
-    def test_multiple_messages_in_sequence(self, redis_client):
+    def test_multiple_messages_in_sequence(self, redis_client, pubsub, channel):
         """Should receive multiple messages in order."""
-        pubsub = redis_client.pubsub()
-        pubsub.subscribe(API_REDIS_STATE_UPDATE_CHANNEL)
-
-        # Wait for subscription to be confirmed
-        assert wait_for_subscription(pubsub), "Subscription not confirmed"
-
-        # Publish multiple messages
-        for i in range(5):
-            redis_client.publish(
-                API_REDIS_STATE_UPDATE_CHANNEL,
-                json.dumps({"sequence": i})
-            )
+        # Publish multiple messages in one pipelined round trip
+        messages = [orjson.dumps({"sequence": i}) for i in range(5)]
+        pipe = redis_client.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(channel, message)
+        pipe.execute()
 
         # Receive all messages
         received = []
         for _ in range(10):  # Try more times to account for timing
             msg = pubsub.get_message(timeout=1.0)
             if msg and msg["type"] == "message":
-                received.append(json.loads(msg["data"]))
+                received.append(orjson.loads(msg["data"]))
             if len(received) == 5:
                 break
 
         assert len(received) == 5
         assert [r["sequence"] for r in received] == [0, 1, 2, 3, 4]
 
-        pubsub.close()
-
-    def test_subscriber_count(self, redis_client):
+    def test_subscriber_count(self, redis_client, pubsub, channel):
         """Should report correct subscriber count."""
-        pubsub1 = redis_client.pubsub()
-        pubsub1.subscribe(API_REDIS_STATE_UPDATE_CHANNEL)
-        wait_for_subscription(pubsub1)
-
-        pubsub2 = redis_client.pubsub()
-        pubsub2.subscribe(API_REDIS_STATE_UPDATE_CHANNEL)
-        wait_for_subscription(pubsub2)
+        second = redis_client.pubsub()
+        second.subscribe(channel)
+        wait_for_subscription(second)
 
         # Publish returns number of subscribers
-        count = redis_client.publish(API_REDIS_STATE_UPDATE_CHANNEL, "test")
+        count = redis_client.publish(channel, "test")
 
         assert count == 2
 
-        pubsub1.close()
-        pubsub2.close()
+        second.close()
 
-    @pytest.mark.asyncio
-    async def test_async_pubsub(self, async_redis_client):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_async_pubsub(self, async_redis_client, channel):
         """Should work with async Redis client."""
         pubsub = async_redis_client.pubsub()
-        await pubsub.subscribe(API_REDIS_STATE_UPDATE_CHANNEL)
+        await pubsub.subscribe(channel)
 
         # Wait for subscription confirmation
         msg = await pubsub.get_message(timeout=5.0)
@@ -166,20 +201,17 @@ class TestRedisPubSubIntegration:
 
         # Publish a message
         await async_redis_client.publish(
-            API_REDIS_STATE_UPDATE_CHANNEL,
-            json.dumps({"async": True})
+            channel,
+            orjson.dumps({"async": True})
         )
 
-        # Small delay to ensure message is delivered
-        await asyncio.sleep(0.1)
-
+        # Blocks on the socket until the message arrives
         message = await pubsub.get_message(timeout=5.0)
 
         assert message is not None
-        assert json.loads(message["data"]) == {"async": True}
+        assert orjson.loads(message["data"]) == {"async": True}
 
-        await pubsub.close()
-        await async_redis_client.close()
+        await pubsub.aclose()
 
 
 class TestRedisConnectionIntegration:
@@ -203,4 +235,4 @@ class TestRedisConnectionIntegration:
         value = redis_client.get("test_key")
         redis_client.delete("test_key")
 
-        assert value == "test_value"
+        assert value == b"test_value"
@@ -212,11 +212,11 @@ class TestGetStateById:
             state.get_state_by_id(1)
 
 
-class TestOrmToDict:
-    """Unit tests for _orm_to_dict helper function."""
+class TestRowToDict:
+    """Unit tests for _row_to_dict helper function."""
 
     def test_converts_all_fields_correctly(self, patch_state_db):
-        """Should correctly map all ORM fields to dictionary fields."""
+        """Should correctly map all selected columns to dictionary fields."""
         with state.SessionLocal.begin() as db:
             db.execute(
                 insert(GlobalState).values(
@@ -234,8 +234,8 @@ class TestOrmToDict:
         with state.SessionLocal() as db:
             from sqlalchemy import select
 
-            orm_obj = db.execute(select(GlobalState)).scalars().first()
-            result = state._orm_to_dict(orm_obj)
+            row = db.execute(select(*state._STATE_COLUMNS)).first()
+            result = state._row_to_dict(row)
 
         assert result["id"] == 1
         assert result["last_applied_offset"] == 42
@@ -267,8 +267,8 @@ class TestOrmToDict:
         with state.SessionLocal() as db:
             from sqlalchemy import select
 
-            orm_obj = db.execute(select(GlobalState)).scalars().first()
-            result = state._orm_to_dict(orm_obj)
+            row = db.execute(select(*state._STATE_COLUMNS)).first()
+            result = state._row_to_dict(row)
 
         assert isinstance(result, dict)
         # Dictionary can be modified
@@ -0,0 +1,7 @@
+"""Shared HealthCheckResult instances for the API unit tests."""
+
+from api.health import HealthCheckResult
+
+# HealthCheckResult is frozen, so tests can share these instances
+HEALTHY = HealthCheckResult(healthy=True, latency_ms=1.0)
+UNHEALTHY = HealthCheckResult(healthy=False, message="Connection refused")
@@ -11,9 +11,20 @@ from api.health import (
     check_redis_health,
     check_kafka_health,
     check_database_health,
+    gather_health,
     aggregate_health,
+    clear_health_cache,
     HealthCheckResult,
 )
+from health_results import HEALTHY, UNHEALTHY
+
+
+@pytest.fixture(autouse=True)
+def reset_health_cache():
+    """Ensure cached results never leak between tests."""
+    clear_health_cache()
+    yield
+    clear_health_cache()
 
 
 class FakeRedis:
@@ -32,6 +43,8 @@ class FakeRedis:
 class FakeProducer:
     """Fake Kafka producer for testing."""
 
+    __slots__ = ("_brokers", "_raise_error")
+
     def __init__(self, brokers=None, raise_error=None):
         self._brokers = brokers if brokers is not None else {1: "broker1"}
         self._raise_error = raise_error
@@ -45,10 +58,41 @@ class FakeProducer:
 class FakeMetadata:
     """Fake Kafka metadata."""
 
+    __slots__ = ("brokers",)
+
     def __init__(self, brokers):
         self.brokers = brokers
 
 
+class FakeResult:
+    """Fake SQLAlchemy result for SELECT 1."""
+
+    __slots__ = ()
+
+    def fetchone(self):
+        return (1,)
+
+
+class FakeSession:
+    """Fake SQLAlchemy session usable as a context manager."""
+
+    __slots__ = ("_raise_error",)
+
+    def __init__(self, raise_error=None):
+        self._raise_error = raise_error
+
+    def __enter__(self):
+        if self._raise_error:
+            raise self._raise_error
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement):
+        return FakeResult()
+
+
 class TestCheckRedisHealth:
     """Unit tests for check_redis_health function."""
 
@@ -72,32 +116,22 @@ class TestCheckRedisHealth:
         assert result.healthy is False
         assert result.message == "PING returned False"
 
-    def test_returns_unhealthy_on_connection_error(self):
-        """Should return unhealthy on ConnectionError."""
-        fake_redis = FakeRedis(raise_error=redis.ConnectionError("Connection refused"))
+    @pytest.mark.parametrize(
+        "error, expected_message",
+        [
+            (redis.ConnectionError("Connection refused"), "Connection error"),
+            (redis.TimeoutError("Timed out"), "Timeout"),
+            (RuntimeError("Unexpected"), "Unexpected error"),
+        ],
+    )
+    def test_returns_unhealthy_on_error(self, error, expected_message):
+        """Should return unhealthy with a message matching the error type."""
+        fake_redis = FakeRedis(raise_error=error)
 
         result = check_redis_health(fake_redis)
 
         assert result.healthy is False
-        assert "Connection error" in result.message
-
-    def test_returns_unhealthy_on_timeout_error(self):
-        """Should return unhealthy on TimeoutError."""
-        fake_redis = FakeRedis(raise_error=redis.TimeoutError("Timed out"))
-
-        result = check_redis_health(fake_redis)
-
-        assert result.healthy is False
-        assert "Timeout" in result.message
-
-    def test_returns_unhealthy_on_unexpected_error(self):
-        """Should return unhealthy on unexpected errors."""
-        fake_redis = FakeRedis(raise_error=RuntimeError("Unexpected"))
-
-        result = check_redis_health(fake_redis)
-
-        assert result.healthy is False
-        assert "Unexpected error" in result.message
+        assert expected_message in result.message
 
     def test_measures_latency(self):
         """Should measure and return latency."""
@@ -131,9 +165,13 @@ class TestCheckKafkaHealth:
         assert result.healthy is False
         assert "No brokers" in result.message
 
-    def test_returns_unhealthy_on_error(self):
+    @pytest.mark.parametrize(
+        "error",
+        [Exception("Kafka error"), TimeoutError("Timed out")],
+    )
+    def test_returns_unhealthy_on_error(self, error):
         """Should return unhealthy on Kafka errors."""
-        fake_producer = FakeProducer(raise_error=Exception("Kafka error"))
+        fake_producer = FakeProducer(raise_error=error)
 
         result = check_kafka_health(fake_producer)
 
@@ -155,41 +193,135 @@ class TestCheckDatabaseHealth:
 
     def test_returns_healthy_on_successful_query(self):
         """Should return healthy when query succeeds."""
-        # Create a mock session factory
-        mock_session = MagicMock()
-        mock_session.execute.return_value.fetchone.return_value = (1,)
-
-        mock_factory = MagicMock()
-        mock_factory.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_factory.return_value.__exit__ = MagicMock(return_value=False)
-
-        result = check_database_health(mock_factory)
+        result = check_database_health(FakeSession)
 
         assert result.healthy is True
         assert result.latency_ms is not None
 
     def test_returns_unhealthy_on_error(self):
         """Should return unhealthy on database errors."""
-        mock_factory = MagicMock()
-        mock_factory.return_value.__enter__ = MagicMock(
-            side_effect=Exception("DB error")
+        result = check_database_health(
+            lambda: FakeSession(raise_error=Exception("DB error"))
         )
 
-        result = check_database_health(mock_factory)
-
         assert result.healthy is False
         assert "Error" in result.message
 
 
+class TestHealthCheckCache:
+    """Unit tests for TTL caching of health check results."""
+
+    def test_reuses_result_within_ttl(self):
+        """Should only hit the backend once within the TTL window."""
+        fake_redis = FakeRedis(ping_result=True)
+        fake_redis.ping = MagicMock(return_value=True)
+
+        first = check_redis_health(fake_redis)
+        second = check_redis_health(fake_redis)
+
+        assert fake_redis.ping.call_count == 1
+        assert second is first
+
+    def test_refreshes_result_after_ttl(self):
+        """Should re-run the check once the cached result has expired."""
+        fake_producer = FakeProducer(brokers={1: "broker1"})
+        clock = [0.0]
+
+        with patch("api.health.time.monotonic", lambda: clock[0]):
+            check_kafka_health(fake_producer, cache_ttl=5.0)
+            fake_producer._raise_error = Exception("Kafka error")
+            clock[0] = 10.0
+            result = check_kafka_health(fake_producer, cache_ttl=5.0)
+
+        assert result.healthy is False
+
+    def test_zero_ttl_disables_caching(self):
+        """Should hit the backend on every call when cache_ttl is 0."""
+        fake_redis = FakeRedis(ping_result=True)
+        fake_redis.ping = MagicMock(return_value=True)
+
+        check_redis_health(fake_redis, cache_ttl=0)
+        check_redis_health(fake_redis, cache_ttl=0)
+
+        assert fake_redis.ping.call_count == 2
+
+    def test_caches_per_component(self):
+        """Should keep separate results for each dependency."""
+        fake_redis = FakeRedis(ping_result=True)
+        fake_producer = FakeProducer(brokers={})
+
+        assert check_redis_health(fake_redis).healthy is True
+        assert check_kafka_health(fake_producer).healthy is False
+
+    def test_clear_drops_cached_results(self):
+        """Should re-run the check after clear_health_cache()."""
+        fake_redis = FakeRedis(ping_result=True)
+        fake_redis.ping = MagicMock(return_value=True)
+
+        check_redis_health(fake_redis)
+        clear_health_cache()
+        check_redis_health(fake_redis)
+
+        assert fake_redis.ping.call_count == 2
+
+
+class TestGatherHealth:
+    """Unit tests for gather_health function."""
+
+    def test_returns_result_for_each_check(self):
+        """Should return one result per named check."""
+        checks = {
+            "redis": lambda: HEALTHY,
+            "kafka": lambda: UNHEALTHY,
+        }
+
+        results = gather_health(checks)
+
+        assert results["redis"].healthy is True
+        assert results["kafka"].healthy is False
+
+    def test_runs_checks_concurrently(self):
+        """Should run checks in parallel rather than one after another."""
+        import threading
+
+        barrier = threading.Barrier(3, timeout=2.0)
+
+        def check():
+            barrier.wait()
+            return HealthCheckResult(healthy=True)
+
+        results = gather_health({"a": check, "b": check, "c": check})
+
+        assert all(r.healthy for r in results.values())
+
+    def test_marks_raising_check_unhealthy(self):
+        """Should convert an exception from a check into an unhealthy result."""
+
+        def broken():
+            raise RuntimeError("boom")
+
+        results = gather_health(
+            {"redis": broken, "kafka": lambda: HealthCheckResult(healthy=True)}
+        )
+
+        assert results["redis"].healthy is False
+        assert "boom" in results["redis"].message
+        assert results["kafka"].healthy is True
+
+    def test_handles_empty_checks(self):
+        """Should return an empty dict for no checks."""
+        assert gather_health({}) == {}
+
+
 class TestAggregateHealth:
     """Unit tests for aggregate_health function."""
 
     def test_returns_healthy_when_all_checks_pass(self):
         """Should return 'healthy' when all checks pass."""
         checks = {
-            "redis": HealthCheckResult(healthy=True, latency_ms=1.0),
-            "kafka": HealthCheckResult(healthy=True, latency_ms=2.0),
-            "database": HealthCheckResult(healthy=True, latency_ms=3.0),
+            "redis": HEALTHY,
+            "kafka": HEALTHY,
+            "database": HEALTHY,
         }
 
         status, checks_dict = aggregate_health(checks)
@@ -200,8 +332,8 @@ class TestAggregateHealth:
     def test_returns_unhealthy_when_all_checks_fail(self):
         """Should return 'unhealthy' when all checks fail."""
         checks = {
-            "redis": HealthCheckResult(healthy=False, message="Error"),
-            "kafka": HealthCheckResult(healthy=False, message="Error"),
+            "redis": UNHEALTHY,
+            "kafka": UNHEALTHY,
         }
 
         status, checks_dict = aggregate_health(checks)
@@ -212,8 +344,8 @@ class TestAggregateHealth:
     def test_returns_degraded_when_some_checks_fail(self):
         """Should return 'degraded' when some checks fail."""
         checks = {
-            "redis": HealthCheckResult(healthy=True, latency_ms=1.0),
-            "kafka": HealthCheckResult(healthy=False, message="Error"),
+            "redis": HEALTHY,
+            "kafka": UNHEALTHY,
         }
 
         status, checks_dict = aggregate_health(checks)
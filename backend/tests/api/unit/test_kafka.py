@@ -166,6 +166,17 @@ class TestCreateProducer:
         assert "bootstrap.servers" in created_with_config
         assert "client.id" in created_with_config
 
+    def test_prod_config_is_accepted_by_librdkafka(self):
+        """Should build a real Producer from the production config."""
+        from confluent_kafka import Producer
+        from api.config import APISettings
+
+        prod_settings = APISettings(
+            env="prod", KAFKA_API_KEY="key", KAFKA_API_SECRET="secret"
+        )
+
+        Producer(prod_settings.kafka_config)
+
 
 class TestSendMessage:
     """Unit tests for send_message function."""
@@ -240,13 +251,15 @@ class TestSendMessage:
         callback = producer.produced_messages[0]["callback"]
         assert callback is shared_kafka.delivery_callback
 
-    def test_calls_poll_after_produce(self):
-        """Should call poll(0) to trigger delivery callbacks."""
+    def test_does_not_poll_per_message(self):
+        """Should leave polling to drain_producer so sends can batch."""
         producer = FakeProducer()
 
+        shared_kafka.send_message(producer=producer, value={"data": "test"})
         shared_kafka.send_message(producer=producer, value={"data": "test"})
 
-        assert producer.poll_count == 1
+        assert len(producer.produced_messages) == 2
+        assert producer.poll_count == 0
 
     def test_handles_unicode_key(self):
         """Should properly encode unicode characters in key."""
@@ -276,6 +289,20 @@ class TestSendMessage:
         assert json.loads(produced_value.decode("utf-8")) == value
 
 
+class TestDrainProducer:
+    """Unit tests for drain_producer function."""
+
+    def test_polls_once_without_blocking(self):
+        """Should call poll once with a zero timeout by default."""
+        producer = FakeProducer()
+        timeouts = []
+        producer.poll = lambda timeout: timeouts.append(timeout) or 0
+
+        shared_kafka.drain_producer(producer)
+
+        assert timeouts == [0.0]
+
+
 class TestFlushProducer:
     """Unit tests for flush_producer function."""
 
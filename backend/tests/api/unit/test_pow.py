@@ -0,0 +1,229 @@
+"""
+Unit tests for the proof-of-work challenge system.
+
+These tests verify challenge signing, solving and verification using a
+fake Redis client for replay protection.
+"""
+
+import hashlib
+import pytest
+import api.pow as pow_module
+from api.pow import (
+    Challenge,
+    Solution,
+    generate_challenge,
+    solve_challenge,
+    verify_solution,
+)
+
+
+class FakeRedis:
+    """Fake Redis client implementing the commands used for replay protection."""
+
+    def __init__(self):
+        self.store = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+
+def _solution_for(challenge: Challenge, nonce: str) -> Solution:
+    return Solution(
+        challenge_id=challenge.challenge_id,
+        difficulty=challenge.difficulty,
+        expires_at=challenge.expires_at,
+        signature=challenge.signature,
+        nonce=nonce,
+    )
+
+
+@pytest.fixture(autouse=True)
+def disable_bypass(monkeypatch):
+    """Always exercise the real verification path."""
+    monkeypatch.setattr(pow_module, "POW_BYPASS", False)
+
+
+class TestCheckHashDifficulty:
+    """Unit tests for _check_hash_difficulty function."""
+
+    @pytest.mark.parametrize(
+        "digest_hex, difficulty, expected",
+        [
+            ("ff" + "00" * 31, 0, True),
+            ("0f" + "00" * 31, 1, True),
+            ("10" + "00" * 31, 1, False),
+            ("00ff" + "00" * 30, 2, True),
+            ("01ff" + "00" * 30, 2, False),
+            ("000f" + "ff" * 30, 3, True),
+            ("0010" + "ff" * 30, 3, False),
+            ("00" * 32, 64, True),
+            ("00" * 32, 65, False),
+        ],
+    )
+    def test_matches_hex_prefix_semantics(self, digest_hex, difficulty, expected):
+        """Should agree with counting leading zeros on the hex digest."""
+        digest = bytes.fromhex(digest_hex)
+
+        assert pow_module._check_hash_difficulty(digest, difficulty) is expected
+
+
+class TestSolveChallenge:
+    """Unit tests for solve_challenge function."""
+
+    @pytest.mark.parametrize("difficulty", [0, 1, 2, 3])
+    def test_nonce_produces_required_leading_zeros(self, difficulty):
+        """Should return a nonce whose hash has `difficulty` leading hex zeros."""
+        challenge = generate_challenge(difficulty=difficulty)
+
+        nonce = solve_challenge(challenge)
+
+        digest = hashlib.sha256(f"{challenge.challenge_id}:{nonce}".encode())
+        assert digest.hexdigest().startswith("0" * difficulty)
+
+    def test_returns_first_valid_nonce(self):
+        """Should return the smallest nonce that satisfies the difficulty."""
+        challenge = generate_challenge(difficulty=2)
+
+        nonce = solve_challenge(challenge)
+
+        for candidate in range(int(nonce)):
+            digest = hashlib.sha256(f"{challenge.challenge_id}:{candidate}".encode())
+            assert not digest.hexdigest().startswith("00")
+
+
+class TestVerifySolution:
+    """Unit tests for verify_solution function."""
+
+    def test_accepts_valid_solution(self):
+        """Should accept a correctly solved, unused challenge."""
+        challenge = generate_challenge(difficulty=2)
+        solution = _solution_for(challenge, solve_challenge(challenge))
+
+        is_valid, error = verify_solution(FakeRedis(), solution)
+
+        assert is_valid is True
+        assert error is None
+
+    def test_rejects_tampered_signature(self):
+        """Should reject a challenge whose parameters were modified."""
+        challenge = generate_challenge(difficulty=2)
+        solution = Solution(
+            challenge_id=challenge.challenge_id,
+            difficulty=0,
+            expires_at=challenge.expires_at,
+            signature=challenge.signature,
+            nonce="0",
+        )
+
+        is_valid, error = verify_solution(FakeRedis(), solution)
+
+        assert is_valid is False
+        assert error == "Invalid challenge signature"
+
+    def test_rejects_expired_challenge(self, monkeypatch):
+        """Should reject a challenge past its expiry."""
+        challenge = generate_challenge(difficulty=0)
+        solution = _solution_for(challenge, "0")
+        monkeypatch.setattr(pow_module.time, "time", lambda: challenge.expires_at + 1)
+
+        is_valid, error = verify_solution(FakeRedis(), solution)
+
+        assert is_valid is False
+        assert error == "Challenge expired"
+
+    def test_rejects_invalid_proof_of_work(self):
+        """Should reject a nonce whose hash lacks the required zeros."""
+        challenge = generate_challenge(difficulty=4)
+        nonce = 0
+        while (
+            hashlib.sha256(f"{challenge.challenge_id}:{nonce}".encode())
+            .hexdigest()
+            .startswith("0")
+        ):
+            nonce += 1
+
+        is_valid, error = verify_solution(
+            FakeRedis(), _solution_for(challenge, str(nonce))
+        )
+
+        assert is_valid is False
+        assert error == "Invalid proof of work"
+
+    def test_rejects_replayed_challenge(self):
+        """Should reject the second submission of the same challenge."""
+        redis_client = FakeRedis()
+        challenge = generate_challenge(difficulty=1)
+        solution = _solution_for(challenge, solve_challenge(challenge))
+
+        first, _ = verify_solution(redis_client, solution)
+        second, error = verify_solution(redis_client, solution)
+
+        assert first is True
+        assert second is False
+        assert error == "Challenge already used"
+
+    def test_fails_open_when_redis_unavailable(self):
+        """Should accept a valid solution if Redis errors."""
+
+        class BrokenRedis:
+            def set(self, *args, **kwargs):
+                raise ConnectionError("Redis down")
+
+        challenge = generate_challenge(difficulty=1)
+        solution = _solution_for(challenge, solve_challenge(challenge))
+
+        is_valid, error = verify_solution(BrokenRedis(), solution)
+
+        assert is_valid is True
+        assert error is None
+
+    def test_invalid_proof_of_work_never_touches_redis(self):
+        """Should reject a bad nonce without a Redis round trip."""
+
+        class ExplodingRedis:
+            def set(self, *args, **kwargs):
+                raise AssertionError("Redis must not be called")
+
+        challenge = generate_challenge(difficulty=64)
+
+        is_valid, error = verify_solution(
+            ExplodingRedis(), _solution_for(challenge, "0")
+        )
+
+        assert is_valid is False
+        assert error == "Invalid proof of work"
+
+    def test_rejected_solution_does_not_consume_challenge(self):
+        """Should leave the challenge claimable after a failed attempt."""
+        redis_client = FakeRedis()
+        challenge = generate_challenge(difficulty=64)
+
+        verify_solution(redis_client, _solution_for(challenge, "0"))
+
+        assert redis_client.store == {}
+
+
+class TestSignChallenge:
+    """Unit tests for _sign_challenge function."""
+
+    def test_matches_fresh_hmac(self):
+        """Should produce the same signature as a freshly keyed HMAC."""
+        import base64
+        import hmac
+
+        tag = hmac.new(
+            pow_module.POW_SECRET_KEY, b"abc:4:1735500000", hashlib.sha256
+        ).digest()
+        expected = base64.urlsafe_b64encode(tag).rstrip(b"=").decode()
+
+        assert pow_module._sign_challenge("abc", 4, 1735500000) == expected
+
+    def test_repeated_calls_are_independent(self):
+        """Should not carry state between signatures."""
+        first = pow_module._sign_challenge("abc", 4, 1735500000)
+        pow_module._sign_challenge("other", 1, 1)
+
+        assert pow_module._sign_challenge("abc", 4, 1735500000) == first
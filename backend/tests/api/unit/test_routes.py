@@ -4,73 +4,102 @@ Unit tests for API routes.
 These tests verify route handlers using mocked dependencies.
 """
 
+import httpx
 import pytest
+import pytest_asyncio
+import redis
+from confluent_kafka import Producer
 from unittest.mock import MagicMock, patch, AsyncMock
 from fastapi.testclient import TestClient
 from datetime import datetime
 import json
 import time
-
-# Mock the dependencies before importing routes
-# This prevents the module-level producer and redis_client from being created
+import api.routes as routes_module
+from api.health import HealthCheckResult
+from health_results import HEALTHY, UNHEALTHY
 
 
 @pytest.fixture
 def mock_producer():
-    """Create a mock Kafka producer."""
-    producer = MagicMock()
+    """Create a mock Kafka producer limited to the Producer API."""
+    producer = MagicMock(spec=Producer)
     producer.flush.return_value = 0
     return producer
 
 
 @pytest.fixture
 def mock_redis_client():
-    """Create a mock Redis client."""
-    client = MagicMock()
+    """Create a mock Redis client limited to the Redis API."""
+    client = MagicMock(spec=redis.Redis)
     client.ping.return_value = True
     return client
 
 
-@pytest.fixture
-def client(mock_producer, mock_redis_client, monkeypatch):
-    """Create a test client with mocked dependencies."""
-    # Mock create_producer and create_redis_connection before import
-    monkeypatch.setattr(
-        "shared.kafka.create_producer", lambda config=None: mock_producer
-    )
-    monkeypatch.setattr(
-        "api.redis.create_redis_connection", lambda: mock_redis_client
-    )
-    
-    # Mock rate limiter functions to always allow requests (return a client IP)
-    # This must be done before importing routes
-    monkeypatch.setattr(
-        "api.ratelimiter.rate_limit_request", 
-        lambda request, redis_client, limits=None: "127.0.0.1"
-    )
-    monkeypatch.setattr(
-        "api.ratelimiter.rate_limit_press", 
-        lambda request, redis_client: "127.0.0.1"
-    )
-    
-    # Mock PoW verification to always pass
-    monkeypatch.setattr(
-        "api.pow.verify_solution",
-        lambda redis_client, solution: (True, None)
-    )
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI app; dependencies are overridden per test."""
+    return routes_module.app
+
 
-    # Now import routes (which will use our mocked functions)
-    import importlib
-    import api.routes as routes_module
+@pytest.fixture(scope="session")
+def client(app):
+    """Create one test client for the session.
 
-    # Reload to pick up the mocked functions
-    importlib.reload(routes_module)
+    Used without a `with` block so the app lifespan, which creates the real
+    Kafka and Redis clients, never runs.
+    """
+    return TestClient(app)
 
-    # Replace the already-created producer and redis_client
-    monkeypatch.setattr(routes_module, "producer", mock_producer)
-    monkeypatch.setattr(routes_module, "redis_client", mock_redis_client)
 
-    return TestClient(routes_module.app)
+@pytest_asyncio.fixture
+async def async_client(app):
+    """Async client that runs the app on the test's event loop.
+
+    Used for streaming endpoints; ASGITransport does not run the lifespan.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def stub_health(monkeypatch):
+    """Make the routes' health checks return fixed results.
+
+    Call with a HealthCheckResult per component to override; the rest
+    report healthy.
+    """
+    def _stub(redis=HEALTHY, kafka=HEALTHY, database=HEALTHY):
+        monkeypatch.setattr(
+            routes_module, "check_redis_health", lambda client: redis
+        )
+        monkeypatch.setattr(
+            routes_module, "check_kafka_health", lambda producer: kafka
+        )
+        monkeypatch.setattr(
+            routes_module, "check_database_health", lambda session: database
+        )
+
+    return _stub
+
+
+@pytest.fixture(autouse=True)
+def override_dependencies(app, mock_producer, mock_redis_client):
+    """Swap this test's mocks in for the route dependencies."""
+    app.dependency_overrides.update(
+        {
+            routes_module.get_producer: lambda: mock_producer,
+            routes_module.get_redis: lambda: mock_redis_client,
+            # Always allow requests (return a client IP)
+            routes_module.require_rate_limit: lambda: "127.0.0.1",
+            # Skips both the press rate limit and PoW verification
+            routes_module.require_valid_solution: lambda: "127.0.0.1",
+        }
+    )
+    yield
+    app.dependency_overrides.clear()
 
 
 class TestPressButton:
@@ -119,74 +148,69 @@ class TestPressButton:
         data = response.json()
         assert before <= data["timestamp_ms"] <= after
 
-    def test_sends_message_to_kafka(self, client, mock_producer, monkeypatch, press_request_body):
+    def test_sends_message_to_kafka(self, client, mock_producer, press_request_body):
         """Should send message to Kafka with correct payload."""
-        sent_messages = []
-
-        def capture_send(producer, value, key=None, topic=None):
-            sent_messages.append({"value": value, "key": key})
-
-        import api.routes as routes_module
-
-        monkeypatch.setattr(routes_module, "send_message", capture_send)
-
         response = client.post("/v1/events/press", json=press_request_body)
 
-        assert len(sent_messages) == 1
-        assert "timestamp_ms" in sent_messages[0]["value"]
-        assert "request_id" in sent_messages[0]["value"]
+        mock_producer.produce.assert_called_once()
+        sent = json.loads(mock_producer.produce.call_args.kwargs["value"])
+        assert "timestamp_ms" in sent
+        assert "request_id" in sent
 
-    def test_returns_503_when_flush_times_out(self, client, mock_producer, monkeypatch, press_request_body):
+    def test_returns_503_when_flush_times_out(self, client, mock_producer, press_request_body):
         """Should return 503 when message flush times out."""
-        import api.routes as routes_module
-
         # Simulate messages remaining after flush
-        def mock_flush(producer):
-            return 1  # 1 message still in queue
-
-        monkeypatch.setattr(routes_module, "flush_producer", mock_flush)
+        mock_producer.flush.return_value = 1
 
         response = client.post("/v1/events/press", json=press_request_body)
 
         assert response.status_code == 503
         assert "timed out" in response.json()["detail"].lower()
 
-    def test_returns_503_on_buffer_error(self, client, mock_producer, monkeypatch, press_request_body):
+    def test_returns_503_on_buffer_error(self, client, mock_producer, press_request_body):
         """Should return 503 when producer buffer is full."""
-        import api.routes as routes_module
-
-        def mock_send(*args, **kwargs):
-            raise BufferError("Buffer full")
-
-        monkeypatch.setattr(routes_module, "send_message", mock_send)
+        mock_producer.produce.side_effect = BufferError("Buffer full")
 
         response = client.post("/v1/events/press", json=press_request_body)
 
         assert response.status_code == 503
         assert "overloaded" in response.json()["detail"].lower()
 
-    def test_returns_503_on_kafka_exception(self, client, mock_producer, monkeypatch, press_request_body):
+    def test_returns_503_on_kafka_exception(self, client, mock_producer, press_request_body):
         """Should return 503 when Kafka raises an exception."""
-        import api.routes as routes_module
         from shared.kafka import KafkaException
 
-        def mock_send(*args, **kwargs):
-            raise KafkaException("Broker unavailable")
-
-        monkeypatch.setattr(routes_module, "send_message", mock_send)
+        mock_producer.produce.side_effect = KafkaException("Broker unavailable")
 
         response = client.post("/v1/events/press", json=press_request_body)
 
         assert response.status_code == 503
         assert "unavailable" in response.json()["detail"].lower()
 
+    def test_returns_400_on_invalid_solution(self, app, client, monkeypatch, press_request_body):
+        """Should reject the press when the PoW solution is invalid."""
+        # Run the real PoW dependency, keeping only the rate limit bypassed
+        del app.dependency_overrides[routes_module.require_valid_solution]
+        app.dependency_overrides[routes_module.require_press_rate_limit] = (
+            lambda: "127.0.0.1"
+        )
+        monkeypatch.setattr(
+            routes_module,
+            "verify_solution",
+            lambda redis_client, solution: (False, "Invalid proof of work"),
+        )
+
+        response = client.post("/v1/events/press", json=press_request_body)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid proof of work"
+
 
 class TestGetCurrentState:
     """Unit tests for GET /v1/states/current endpoint."""
 
     def test_returns_state_when_found(self, client, monkeypatch):
         """Should return 200 with state data when state exists."""
-        import api.routes as routes_module
         from datetime import datetime, timezone
         from api.schemas import Phase
 
@@ -213,8 +237,6 @@ class TestGetCurrentState:
 
     def test_returns_404_when_no_state(self, client, monkeypatch):
         """Should return 404 when no state is found."""
-        import api.routes as routes_module
-
         def mock_get_state():
             raise LookupError("No state found")
 
@@ -229,105 +251,69 @@ class TestGetCurrentState:
 class TestStreamState:
     """Unit tests for GET /v1/states/stream endpoint."""
 
-    def test_returns_event_stream_content_type(self, client, monkeypatch):
-        """Should return text/event-stream content type."""
-        import api.routes as routes_module
+    @pytest.fixture(autouse=True)
+    def empty_stream(self, monkeypatch):
+        """Replace the pub/sub listener with one that yields nothing."""
 
-        async def mock_listen():
-            # Empty generator
+        async def mock_listen(redis_client):
             if False:
                 yield
 
         monkeypatch.setattr(routes_module, "listen_on_pubsub", mock_listen)
 
-        response = client.get("/v1/states/stream")
+    async def test_returns_event_stream_content_type(self, async_client):
+        """Should return text/event-stream content type."""
+        response = await async_client.get("/v1/states/stream")
 
         assert response.headers["content-type"].startswith("text/event-stream")
 
-    def test_returns_correct_headers(self, client, monkeypatch):
+    async def test_returns_correct_headers(self, async_client):
         """Should return cache-control and connection headers."""
-        import api.routes as routes_module
-
-        async def mock_listen():
-            if False:
-                yield
-
-        monkeypatch.setattr(routes_module, "listen_on_pubsub", mock_listen)
-
-        response = client.get("/v1/states/stream")
+        response = await async_client.get("/v1/states/stream")
 
         assert response.headers.get("cache-control") == "no-cache"
         assert response.headers.get("x-accel-buffering") == "no"
 
+    async def test_empty_stream_has_no_error_event(self, async_client):
+        """Should end cleanly when the listener yields nothing."""
+        response = await async_client.get("/v1/states/stream")
 
-class TestHealthCheck:
-    """Unit tests for GET /health endpoint."""
-
-    def test_returns_200_when_all_healthy(self, client, monkeypatch):
-        """Should return 200 when all checks pass."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
+        assert response.text == ""
 
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=True, latency_ms=1.0)
 
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.0)
-
-        def mock_db_health(session):
-            return HealthCheckResult(healthy=True, latency_ms=3.0)
+class TestHealthCheck:
+    """Unit tests for GET /health endpoint."""
 
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
-        monkeypatch.setattr(routes_module, "check_database_health", mock_db_health)
+    @pytest.mark.parametrize(
+        "unhealthy, expected_code, expected_status",
+        [
+            (None, 200, "healthy"),
+            ("redis", 503, "degraded"),
+            ("kafka", 503, "degraded"),
+            ("database", 503, "degraded"),
+        ],
+    )
+    def test_status_reflects_checks(
+        self, client, stub_health, unhealthy, expected_code, expected_status
+    ):
+        """Should return 200 only when every check passes, else 503."""
+        stub_health(**({unhealthy: UNHEALTHY} if unhealthy else {}))
 
         response = client.get("/health")
 
-        assert response.status_code == 200
+        assert response.status_code == expected_code
         data = response.json()
-        assert data["status"] == "healthy"
+        assert data["status"] == expected_status
         assert "timestamp" in data
         assert "checks" in data
 
-    def test_returns_503_when_any_unhealthy(self, client, monkeypatch):
-        """Should return 503 when any check fails."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=False, message="Connection refused")
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.0)
-
-        def mock_db_health(session):
-            return HealthCheckResult(healthy=True, latency_ms=3.0)
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
-        monkeypatch.setattr(routes_module, "check_database_health", mock_db_health)
-
-        response = client.get("/health")
-
-        assert response.status_code == 503
-
-    def test_includes_all_check_results(self, client, monkeypatch):
+    def test_includes_all_check_results(self, client, stub_health):
         """Should include results for all checked components."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=True, latency_ms=1.5)
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.5, message="2 broker(s)")
-
-        def mock_db_health(session):
-            return HealthCheckResult(healthy=True, latency_ms=3.5)
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
-        monkeypatch.setattr(routes_module, "check_database_health", mock_db_health)
+        stub_health(
+            kafka=HealthCheckResult(
+                healthy=True, latency_ms=2.5, message="2 broker(s)"
+            )
+        )
 
         response = client.get("/health")
 
@@ -335,6 +321,7 @@ class TestHealthCheck:
         assert "redis" in data["checks"]
         assert "kafka" in data["checks"]
         assert "database" in data["checks"]
+        assert data["checks"]["kafka"]["message"] == "2 broker(s)"
 
 
 class TestLivenessProbe:
@@ -368,19 +355,9 @@ class TestLivenessProbe:
 class TestReadinessProbe:
     """Unit tests for GET /health/ready endpoint."""
 
-    def test_returns_200_when_ready(self, client, monkeypatch):
+    def test_returns_200_when_ready(self, client, stub_health):
         """Should return 200 when critical dependencies are healthy."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=True, latency_ms=1.0)
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.0)
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
+        stub_health()
 
         response = client.get("/health/ready")
 
@@ -388,55 +365,25 @@ class TestReadinessProbe:
         data = response.json()
         assert data["status"] == "healthy"
 
-    def test_returns_503_when_redis_unhealthy(self, client, monkeypatch):
+    def test_returns_503_when_redis_unhealthy(self, client, stub_health):
         """Should return 503 when Redis is unhealthy."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=False, message="Connection refused")
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.0)
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
+        stub_health(redis=UNHEALTHY)
 
         response = client.get("/health/ready")
 
         assert response.status_code == 503
 
-    def test_returns_503_when_kafka_unhealthy(self, client, monkeypatch):
+    def test_returns_503_when_kafka_unhealthy(self, client, stub_health):
         """Should return 503 when Kafka is unhealthy."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=True, latency_ms=1.0)
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=False, message="No brokers")
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
+        stub_health(kafka=UNHEALTHY)
 
         response = client.get("/health/ready")
 
         assert response.status_code == 503
 
-    def test_includes_check_details(self, client, monkeypatch):
+    def test_includes_check_details(self, client, stub_health):
         """Should include details for both Redis and Kafka checks."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=True, latency_ms=1.0)
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.0)
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
+        stub_health()
 
         response = client.get("/health/ready")
 
@@ -444,22 +391,11 @@ class TestReadinessProbe:
         assert "redis" in data["checks"]
         assert "kafka" in data["checks"]
 
-    def test_does_not_check_database(self, client, monkeypatch):
+    def test_does_not_check_database(self, client, stub_health):
         """Should not include database in readiness check."""
-        import api.routes as routes_module
-        from api.health import HealthCheckResult
-
-        def mock_redis_health(client):
-            return HealthCheckResult(healthy=True, latency_ms=1.0)
-
-        def mock_kafka_health(producer):
-            return HealthCheckResult(healthy=True, latency_ms=2.0)
-
-        monkeypatch.setattr(routes_module, "check_redis_health", mock_redis_health)
-        monkeypatch.setattr(routes_module, "check_kafka_health", mock_kafka_health)
+        stub_health()
 
         response = client.get("/health/ready")
 
         data = response.json()
         assert "database" not in data["checks"]
-
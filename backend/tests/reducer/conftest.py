@@ -58,7 +58,8 @@ def patch_writer_db(sqlite_engine, monkeypatch):
 @pytest.fixture
 def patch_retriever_db(sqlite_engine, monkeypatch):
     Base.metadata.create_all(sqlite_engine)
-    monkeypatch.setattr(retriever, "engine", sqlite_engine, raising=True)
+    retriever.clear_rules_cache()
+    session_local = sessionmaker(bind=sqlite_engine)
     monkeypatch.setattr(
-        retriever, "SessionLocal", sessionmaker(bind=sqlite_engine), raising=True
+        retriever, "_session_local", lambda: session_local, raising=True
     )
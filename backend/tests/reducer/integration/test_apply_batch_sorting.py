@@ -3,7 +3,6 @@ from dataclasses import dataclass
 from typing import Optional
 
 from shared.models import (
-    CreateGlobalStateEntity,
     GlobalStateEntity,
     PressEvent,
     RulesConfig,
@@ -37,34 +36,31 @@ def _make_event(offset: int, ts: int) -> PressEvent:
 def test_apply_batch_sorts_by_offset(
     monkeypatch: pytest.MonkeyPatch, rules_config: RulesConfig
 ):
-    applied_offsets: list[int] = []
-
-    def fake_apply_event(
-        state: CreateGlobalStateEntity,
-        event: PressEvent,
-        rules_config: RulesConfig,
-        rules_hash: str,
-    ) -> CreateGlobalStateEntity:
-        applied_offsets.append(event.offset)
-        # Return new state with last_applied_offset updated to this event's offset
-        return CreateGlobalStateEntity(
-            last_applied_offset=event.offset,
-            updated_at_ms=getattr(state, "updated_at_ms", 0),
-            ruleshash=rules_hash,
-            counter=getattr(state, "counter", 0) + 1,
-            phase=getattr(state, "phase", 0),
-            entropy=getattr(state, "entropy", 0),
-            reveal_until_ms=getattr(state, "reveal_until_ms", 0),
-            cooldown_ms=getattr(state, "cooldown_ms", None),
+    applied_timestamps: list[int] = []
+    original_fold = updater.rules_logic.fold_events
+
+    def recording_fold(entropy, updated_at_ms, reveal_until_ms, timestamps_ms, rules):
+        applied_timestamps.extend(timestamps_ms)
+        return original_fold(
+            entropy, updated_at_ms, reveal_until_ms, timestamps_ms, rules
         )
 
-    monkeypatch.setattr(updater, "apply_event", fake_apply_event)
+    monkeypatch.setattr(updater.rules_logic, "fold_events", recording_fold)
 
     events = [_make_event(5, 1050), _make_event(1, 1010), _make_event(3, 1030)]
     state = _make_state()
     result = updater.apply_batch(state, events, rules_config, "hash")
 
-    # Ensure events were processed in offset order
-    assert applied_offsets == [1, 3, 5]
+    # Ensure events were processed in offset order (timestamps follow offsets)
+    assert applied_timestamps == [1010, 1030, 1050]
     # The resulting state's last_applied_offset should be the highest offset
     assert result.last_applied_offset == 5
+
+
+def test_apply_batch_ordered_and_shuffled_batches_agree(rules_config: RulesConfig):
+    ordered = [_make_event(o, 1000 + 10 * o) for o in range(1, 6)]
+    shuffled = [ordered[i] for i in (3, 0, 4, 2, 1)]
+
+    assert updater.apply_batch(
+        _make_state(), ordered, rules_config, "hash"
+    ) == updater.apply_batch(_make_state(), shuffled, rules_config, "hash")
@@ -5,7 +5,7 @@ import shared.rules as retriever
 
 
 def test_get_latest_rules_returns_latest_ruleset(patch_retriever_db):
-    with retriever.SessionLocal.begin() as db:
+    with retriever._session_local().begin() as db:
         db.execute(
             insert(Ruleset).values(
                 version=1,
@@ -49,3 +49,69 @@ def test_get_latest_rules_returns_latest_ruleset(patch_retriever_db):
     assert rs_entity.version == 2
     assert rs_entity.hash == "h2"
     assert rs_cfg.calm_threshold == 0.25
+
+
+def test_get_rules_by_hash_is_memoized(patch_retriever_db):
+    with retriever._session_local().begin() as db:
+        db.execute(
+            insert(Ruleset).values(
+                version=1,
+                hash="h1",
+                ruleset={
+                    "entropy_alpha": 0.2,
+                    "max_rate_for_entropy": 10.0,
+                    "calm_threshold": 0.3,
+                    "hot_threshold": 0.6,
+                    "chaos_threshold": 0.85,
+                    "cooldown_calm_ms": 1000,
+                    "cooldown_warm_ms": 2000,
+                    "cooldown_chaos_ms": 5000,
+                    "reveal_calm_ms": 200,
+                    "reveal_warm_ms": 400,
+                    "reveal_chaos_ms": 800,
+                },
+            )
+        )
+
+    first = retriever.get_rules_by_hash("h1")
+    # A second lookup must not hit the database
+    with retriever._session_local().begin() as db:
+        db.execute(Ruleset.__table__.delete())
+
+    assert retriever.get_rules_by_hash("h1") is first
+
+
+def test_get_rules_by_hash_missing_raises(patch_retriever_db):
+    with pytest.raises(LookupError):
+        retriever.get_rules_by_hash("missing")
+
+
+def test_rules_cache_evicts_least_recently_used(patch_retriever_db, monkeypatch):
+    monkeypatch.setattr(retriever, "RULES_CACHE_SIZE", 2)
+    config = {
+        "entropy_alpha": 0.2,
+        "max_rate_for_entropy": 10.0,
+        "calm_threshold": 0.3,
+        "hot_threshold": 0.6,
+        "chaos_threshold": 0.85,
+        "cooldown_calm_ms": 1000,
+        "cooldown_warm_ms": 2000,
+        "cooldown_chaos_ms": 5000,
+        "reveal_calm_ms": 200,
+        "reveal_warm_ms": 400,
+        "reveal_chaos_ms": 800,
+    }
+    with retriever._session_local().begin() as db:
+        for version, rules_hash in enumerate(["h1", "h2", "h3"], start=1):
+            db.execute(
+                insert(Ruleset).values(
+                    version=version, hash=rules_hash, ruleset=config
+                )
+            )
+
+    retriever.get_rules_by_hash("h1")
+    retriever.get_rules_by_hash("h2")
+    retriever.get_rules_by_hash("h1")  # h2 is now least recently used
+    retriever.get_rules_by_hash("h3")
+
+    assert sorted(retriever.cached_rules_hashes()) == ["h1", "h3"]
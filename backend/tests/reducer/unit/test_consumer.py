@@ -1,5 +1,7 @@
 import types
+import json
 import reducer.consumer as consumer_mod
+from shared.models import PressEvent
 from shared.constants import REDUCER_KAFKA_TOPIC
 
 
@@ -35,3 +37,33 @@ def test_poll_batch_messages_calls_poll(monkeypatch):
     fake = _FakeConsumer({})
     res = consumer_mod.poll_batch_messages(fake, timeout=0.25)
     assert res == []
+
+
+class _FakeMessage:
+    def __init__(self, offset, payload):
+        self._offset = offset
+        self._value = json.dumps(payload).encode("utf-8")
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+
+def test_decode_press_events_builds_press_events():
+    msgs = [
+        _FakeMessage(5, {"timestamp_ms": 1000, "request_id": "abc"}),
+        _FakeMessage(6, {"timestamp_ms": 2000, "request_id": "def"}),
+    ]
+
+    events = consumer_mod.decode_press_events(msgs)
+
+    assert events == [
+        PressEvent(offset=5, timestamp_ms=1000, request_id="abc"),
+        PressEvent(offset=6, timestamp_ms=2000, request_id="def"),
+    ]
+
+
+def test_decode_press_events_empty_batch():
+    assert consumer_mod.decode_press_events([]) == []
@@ -5,6 +5,7 @@ from reducer.rules.logic import (
     transition_phase,
     compute_cooldown_ms,
     compute_reveal_until_ms,
+    fold_events,
 )
 
 
@@ -77,3 +78,21 @@ def test_compute_reveal_until_ms_extends_window(rules_config):
     candidate = now + rules_config.reveal_chaos_ms
     result = compute_reveal_until_ms(prev, now, Phases.CHAOS, rules_config)
     assert result == max(prev, candidate)
+
+
+def test_fold_events_matches_per_event_functions(rules_config):
+    # Mix of bursts and gaps so the run crosses several phases
+    timestamps = [1000, 1005, 1010, 1012, 1012, 1011, 1500, 1501, 1502, 9000]
+    entropy, prev_ms, reveal = 0.3, 0, None
+    for ts in timestamps:
+        dt_sec = None if prev_ms == 0 else max(ts - prev_ms, 1) / 1000.0
+        entropy = update_entropy(entropy, dt_sec, rules_config)
+        phase = transition_phase(entropy, rules_config)
+        reveal = compute_reveal_until_ms(reveal, ts, phase, rules_config)
+        prev_ms = ts
+
+    assert fold_events(0.3, 0, None, timestamps, rules_config) == (
+        entropy,
+        phase,
+        reveal,
+    )
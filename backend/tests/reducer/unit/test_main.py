@@ -0,0 +1,119 @@
+import json
+import logging
+import types
+import pytest
+import reducer.main as main_mod
+from reducer.consumer import decode_press_events
+
+
+class _FakeMessage:
+    def __init__(self, offset):
+        self._offset = offset
+        self._value = json.dumps(
+            {"timestamp_ms": 1000 + offset, "request_id": f"req-{offset}"}
+        ).encode("utf-8")
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+
+class _FakeConsumer:
+    """Hands out scripted batches, then stops the loop like Ctrl-C would."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.commits = []  # asynchronous flag of each commit call
+        self.closed = False
+
+    def next_batch(self):
+        if not self.batches:
+            raise KeyboardInterrupt
+        return [_FakeMessage(offset) for offset in self.batches.pop(0)]
+
+    def commit(self, asynchronous=True):
+        self.commits.append(asynchronous)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def run_reducer(monkeypatch):
+    """Run main() against a fake consumer, clock and persistence layer."""
+    written = []
+
+    def _run(batches, last_applied_offset=-1, clock=None, commit_interval_ms=1000):
+        consumer = _FakeConsumer(batches)
+        ticks = iter(clock or [])
+        state = types.SimpleNamespace(
+            counter=0, last_applied_offset=last_applied_offset
+        )
+
+        def apply_batch(state, events, rules_config, ruleshash):
+            return types.SimpleNamespace(
+                counter=state.counter + len(events),
+                last_applied_offset=events[-1].offset,
+            )
+
+        monkeypatch.setattr(main_mod, "create_consumer", lambda: consumer)
+        monkeypatch.setattr(main_mod, "create_redis_connection", lambda: None)
+        monkeypatch.setattr(
+            main_mod,
+            "get_latest_rules",
+            lambda: (types.SimpleNamespace(hash="h"), None),
+        )
+        monkeypatch.setattr(main_mod, "get_latest_state", lambda: state)
+        monkeypatch.setattr(main_mod, "poll_batch_messages", lambda c: c.next_batch())
+        monkeypatch.setattr(main_mod, "decode_press_events", decode_press_events)
+        monkeypatch.setattr(main_mod, "apply_batch", apply_batch)
+        monkeypatch.setattr(main_mod, "write_state", lambda s: written.append(s) or s)
+        monkeypatch.setattr(main_mod, "publish_state_update", lambda r, s: None)
+        monkeypatch.setattr(
+            main_mod,
+            "time",
+            types.SimpleNamespace(monotonic=lambda: next(ticks, 0.0), sleep=None),
+        )
+        monkeypatch.setattr(main_mod.settings, "commit_interval_ms", commit_interval_ms)
+
+        main_mod.main()
+        return consumer, written
+
+    return _run
+
+
+def test_redelivered_offsets_are_skipped(run_reducer, caplog):
+    with caplog.at_level(logging.WARNING, logger="reducer.main"):
+        consumer, written = run_reducer([[8, 9, 10, 11]], last_applied_offset=9)
+
+    assert len(written) == 1
+    assert written[0].counter == 2
+    assert written[0].last_applied_offset == 11
+    assert "Skipped 2 event(s) at or below last applied offset 9" in caplog.text
+
+
+def test_fully_redelivered_batch_writes_nothing(run_reducer, caplog):
+    with caplog.at_level(logging.WARNING, logger="reducer.main"):
+        consumer, written = run_reducer([[3, 4]], last_applied_offset=4)
+
+    assert written == []
+    assert "Skipped 2 event(s)" in caplog.text
+
+
+def test_sync_commit_only_after_commit_interval(run_reducer):
+    # Start at t=0, then one batch each at t=0.5s, 1.2s and 1.5s
+    consumer, _ = run_reducer(
+        [[0], [1], [2]], clock=[0.0, 0.5, 1.2, 1.5], commit_interval_ms=1000
+    )
+
+    # async, sync once 1s has passed, async again, then the shutdown commit
+    assert consumer.commits == [True, False, True, False]
+
+
+def test_final_sync_commit_on_shutdown(run_reducer):
+    consumer, _ = run_reducer([])
+
+    assert consumer.commits == [False]
+    assert consumer.closed
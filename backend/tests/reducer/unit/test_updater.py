@@ -1,5 +1,5 @@
 from shared.models import GlobalStateEntity, PressEvent, Phases
-from reducer.updater import apply_event
+from reducer.updater import apply_batch, apply_event
 
 
 def _state(
@@ -48,3 +48,20 @@ def test_apply_event_uses_positive_dt_and_progresses(rules_config):
     assert new_state.updated_at_ms == 1100
     assert new_state.last_applied_offset == 11
     assert new_state.entropy >= 0.0
+
+
+def test_apply_batch_matches_chained_apply_event(rules_config):
+    state = _state(updated_at_ms=1000, counter=5, entropy=0.2, phase=0)
+    events = [_event(o, 1000 + 40 * i) for i, o in enumerate([13, 11, 12, 15, 14])]
+
+    expected = state
+    for event in sorted(events, key=lambda e: e.offset):
+        expected = apply_event(expected, event, rules_config, "hash")
+
+    assert apply_batch(state, events, rules_config, "hash") == expected
+
+
+def test_apply_batch_empty_returns_state_unchanged(rules_config):
+    state = _state(updated_at_ms=1000, counter=5)
+
+    assert apply_batch(state, [], rules_config, "hash") is state
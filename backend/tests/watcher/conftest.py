@@ -0,0 +1,44 @@
+import os
+
+os.environ["REDUCER_ENV"] = "dev"
+os.environ["REDUCER_DATABASE_URL"] = "sqlite:///:memory:"
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+os.environ["REDUCER_KAFKA_BROKER_URL"] = "localhost:9092"
+os.environ["KAFKA_BROKER_URL"] = "localhost:9092"
+os.environ["REDUCER_KAFKA_API_KEY"] = "test-key"
+os.environ["KAFKA_API_KEY"] = "test-key"
+os.environ["REDUCER_KAFKA_API_SECRET"] = "test-secret"
+os.environ["KAFKA_API_SECRET"] = "test-secret"
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from shared.models import Base
+import shared.rules as shared_rules
+import shared.state as shared_state
+from shared.rules import clear_rules_cache
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """Create a temporary SQLite database engine for testing."""
+    db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def patch_state_db(sqlite_engine, monkeypatch):
+    """Patch the shared state module to use the SQLite test database."""
+    Base.metadata.create_all(sqlite_engine)
+    clear_rules_cache()
+    session_local = sessionmaker(bind=sqlite_engine)
+    monkeypatch.setattr(
+        shared_state, "_session_local", lambda: session_local, raising=True
+    )
+    monkeypatch.setattr(
+        shared_rules, "_session_local", lambda: session_local, raising=True
+    )
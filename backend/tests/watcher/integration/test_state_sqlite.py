@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import delete, insert
+from shared.models import GlobalState, Ruleset
+from shared.rules import clear_rules_cache
+import shared.state as shared_state
+
+RULESET = {
+    "entropy_alpha": 0.2,
+    "max_rate_for_entropy": 10.0,
+    "calm_threshold": 0.3,
+    "hot_threshold": 0.6,
+    "chaos_threshold": 0.85,
+    "cooldown_calm_ms": 1000,
+    "cooldown_warm_ms": 2000,
+    "cooldown_chaos_ms": 5000,
+    "reveal_calm_ms": 200,
+    "reveal_warm_ms": 400,
+    "reveal_chaos_ms": 800,
+}
+
+
+def _insert_state(db, ruleshash, counter):
+    db.execute(
+        insert(GlobalState).values(
+            last_applied_offset=counter,
+            updated_at_ms=1000 * counter,
+            ruleshash=ruleshash,
+            counter=counter,
+            phase=1,
+            entropy=0.5,
+            reveal_until_ms=0,
+            cooldown_ms=None,
+        )
+    )
+
+
+class TestGetLatestStateWithRules:
+    """Integration tests for get_latest_state_with_rules function."""
+
+    def test_returns_latest_state_with_its_own_ruleset(self, patch_state_db):
+        """Should pair the newest state with the ruleset matching its ruleshash."""
+        with shared_state._session_local().begin() as db:
+            db.execute(
+                insert(Ruleset).values(
+                    version=1, hash="old", ruleset={**RULESET, "cooldown_warm_ms": 1}
+                )
+            )
+            db.execute(insert(Ruleset).values(version=2, hash="new", ruleset=RULESET))
+            _insert_state(db, "new", counter=1)
+            _insert_state(db, "old", counter=2)
+
+        state, rules_entity, rules_config = shared_state.get_latest_state_with_rules()
+
+        assert state["counter"] == 2
+        assert state["ruleshash"] == "old"
+        assert "Ruleset" not in state
+        assert rules_entity.hash == "old"
+        assert rules_entity.version == 1
+        assert rules_config.cooldown_warm_ms == 1
+
+    def test_matches_separate_reads(self, patch_state_db):
+        """Should return the same state dict as get_latest_state."""
+        with shared_state._session_local().begin() as db:
+            db.execute(insert(Ruleset).values(version=1, hash="h", ruleset=RULESET))
+            _insert_state(db, "h", counter=3)
+
+        state, _, _ = shared_state.get_latest_state_with_rules()
+
+        assert state == shared_state.get_latest_state()
+
+    def test_reuses_cached_ruleset_for_known_hash(self, patch_state_db):
+        """Should not need the ruleset row once its hash has been loaded."""
+        with shared_state._session_local().begin() as db:
+            db.execute(insert(Ruleset).values(version=1, hash="h", ruleset=RULESET))
+            _insert_state(db, "h", counter=1)
+
+        _, first_entity, first_config = shared_state.get_latest_state_with_rules()
+        with shared_state._session_local().begin() as db:
+            db.execute(delete(Ruleset))
+            _insert_state(db, "h", counter=2)
+        state, entity, config = shared_state.get_latest_state_with_rules()
+
+        assert state["counter"] == 2
+        assert entity is first_entity
+        assert config is first_config
+
+    def test_refetches_ruleset_evicted_after_query(self, patch_state_db, monkeypatch):
+        """Should fall back to a lookup by hash if the cached entry is evicted."""
+        with shared_state._session_local().begin() as db:
+            db.execute(insert(Ruleset).values(version=1, hash="h", ruleset=RULESET))
+            _insert_state(db, "h", counter=1)
+        shared_state.get_latest_state_with_rules()
+
+        def evicting_hashes():
+            # Report the hash as cached, then lose it before it is read
+            hashes = ["h"]
+            clear_rules_cache()
+            return hashes
+
+        monkeypatch.setattr(shared_state, "cached_rules_hashes", evicting_hashes)
+        state, rules_entity, rules_config = shared_state.get_latest_state_with_rules()
+
+        assert state["ruleshash"] == "h"
+        assert rules_entity.hash == "h"
+        assert rules_config.cooldown_warm_ms == RULESET["cooldown_warm_ms"]
+
+    def test_raises_when_no_state(self, patch_state_db):
+        """Should raise LookupError on an empty database."""
+        with pytest.raises(LookupError):
+            shared_state.get_latest_state_with_rules()
+
+    def test_raises_when_ruleset_missing(self, patch_state_db):
+        """Should raise LookupError if the state's ruleset does not exist."""
+        with shared_state._session_local().begin() as db:
+            _insert_state(db, "missing", counter=1)
+
+        with pytest.raises(LookupError):
+            shared_state.get_latest_state_with_rules()
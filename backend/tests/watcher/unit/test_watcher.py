@@ -3,7 +3,10 @@ from unittest.mock import patch
 import time
 import json
 
+import watcher.watcher_lambda as watcher_module
 from watcher.watcher_lambda import watcher_lambda
+from shared.models import Phases, RulesConfig
+from shared.rules import RULES_CACHE_SIZE
 import shared.kafka as shared_kafka
 import shared.constants as constants
 
@@ -37,21 +40,56 @@ class FakeProducer:
         return self.remaining_after_flush
 
 
+def _rules(calm_ms=1000, warm_ms=1000, chaos_ms=1000):
+    """Build a RulesConfig with the given cooldowns (other fields are unused)."""
+    return RulesConfig(
+        entropy_alpha=0.2,
+        max_rate_for_entropy=10.0,
+        calm_threshold=0.3,
+        hot_threshold=0.6,
+        chaos_threshold=0.85,
+        cooldown_calm_ms=calm_ms,
+        cooldown_warm_ms=warm_ms,
+        cooldown_chaos_ms=chaos_ms,
+        reveal_calm_ms=200,
+        reveal_warm_ms=400,
+        reveal_chaos_ms=800,
+    )
+
+
+def _ns(seconds):
+    """Convert seconds to the integer nanoseconds returned by time.time_ns."""
+    return int(seconds * 1_000_000_000)
+
+
+def _loaded(state, rules=None):
+    """Shape a state dict like get_latest_state_with_rules' return value."""
+    return state, None, rules or _rules()
+
+
+@pytest.fixture(autouse=True)
+def clear_cooldowns():
+    """Start and end each test with no cached cooldowns."""
+    watcher_module._phase_cooldowns.cache_clear()
+    yield
+    watcher_module._phase_cooldowns.cache_clear()
+
+
 class TestWatcherLambda:
     """Unit tests for watcher_lambda function."""
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_returns_success_on_calm_phase(self, mock_time, mock_get_state, mock_producer):
         """Should return success and not send message when phase is CALM."""
         
-        mock_time.return_value = 1000.0  # 1000 seconds since epoch
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(1000.0)  # 1000 seconds since epoch
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": 500000,  # 500 seconds ago
-            "phase": "CALM",
-            "cooldown_calm_ms": 1000,
-        }
+            "phase": Phases.CALM.value,
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
@@ -59,18 +97,18 @@ class TestWatcherLambda:
         assert len(mock_producer.produced_messages) == 0
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_returns_success_when_age_less_than_cooldown(self, mock_time, mock_get_state, mock_producer):
         """Should return success and not send message when age is less than cooldown."""
         
         current_time = 1000.0
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": int((current_time - 0.5) * 1000),  # 500ms ago
-            "phase": "WARM",
-            "cooldown_calm_ms": 1000,  # 1 second cooldown
-        }
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
@@ -78,19 +116,19 @@ class TestWatcherLambda:
         assert len(mock_producer.produced_messages) == 0
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_sends_message_when_phase_not_calm_and_age_exceeds_cooldown(self, mock_time, mock_get_state, mock_producer):
         """Should send message when phase is not CALM and age exceeds cooldown."""
         
         current_time = 1000.0
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 2000,  # 2 seconds ago
-            "phase": "WARM",
-            "cooldown_calm_ms": 1000,  # 1 second cooldown
-        }
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
@@ -102,24 +140,24 @@ class TestWatcherLambda:
         assert message["key"] == constants.API_KAFKA_GLOBAL_KEY.encode("utf-8")
         
         payload = json.loads(message["value"].decode("utf-8"))
-        assert payload["ts"] == timestamp_ms
-        assert payload["request_id"] == f"phase_transition:{timestamp_ms // 60}"
+        assert payload["timestamp_ms"] == timestamp_ms
+        assert payload["request_id"] == f"phase_transition:{Phases.WARM.value}:{timestamp_ms // 1000}"
         assert message["callback"] == shared_kafka.delivery_callback
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_sends_message_when_age_equals_cooldown(self, mock_time, mock_get_state, mock_producer):
         """Should send message when age exactly equals cooldown."""
         
         current_time = 1000.0
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 1000,  # Exactly 1 second ago
-            "phase": "HOT",
-            "cooldown_calm_ms": 1000,
-        }
+            "phase": Phases.HOT.value,
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
@@ -127,19 +165,19 @@ class TestWatcherLambda:
         assert len(mock_producer.produced_messages) == 1
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_handles_chaos_phase(self, mock_time, mock_get_state, mock_producer):
         """Should send message for CHAOS phase when age exceeds cooldown."""
         
         current_time = 2000.0
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 5000,  # 5 seconds ago
-            "phase": "CHAOS",
-            "cooldown_calm_ms": 2000,
-        }
+            "phase": Phases.CHAOS.value,
+            "ruleshash": "h",
+        }, _rules(chaos_ms=2000))
 
         result = watcher_lambda({}, None)
 
@@ -147,41 +185,38 @@ class TestWatcherLambda:
         assert len(mock_producer.produced_messages) == 1
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_handles_phase_as_integer_zero(self, mock_time, mock_get_state, mock_producer):
-        """Should handle phase as integer 0 (CALM) and not send message."""
+        """Should treat phase 0 as CALM and not send message."""
         
         current_time = 1000.0
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": int(current_time * 1000) - 2000,
             "phase": 0,  # CALM as integer
-            "cooldown_calm_ms": 1000,
-        }
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
         assert result == {"success": True}
-        # Phase 0 != "CALM" (string), so condition would pass, but let's verify behavior
-        # Actually, 0 != "CALM" is True, so it would send if age >= cooldown
-        # This test documents the current behavior
-        assert len(mock_producer.produced_messages) == 1
+        assert len(mock_producer.produced_messages) == 0
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_handles_phase_as_integer_non_calm(self, mock_time, mock_get_state, mock_producer):
         """Should send message when phase is integer 1 (WARM) and age exceeds cooldown."""
         
         current_time = 1000.0
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 2000,
             "phase": 1,  # WARM as integer
-            "cooldown_calm_ms": 1000,
-        }
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
@@ -189,61 +224,79 @@ class TestWatcherLambda:
         assert len(mock_producer.produced_messages) == 1
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_uses_cooldown_matching_current_phase(self, mock_time, mock_get_state, mock_producer):
+        """Should compare age against the cooldown for the current phase."""
+        
+        current_time = 1000.0
+        timestamp_ms = int(current_time * 1000)
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": timestamp_ms - 2000,
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        }, _rules(calm_ms=100, warm_ms=5000, chaos_ms=100))
+
+        watcher_lambda({}, None)
+
+        assert len(mock_producer.produced_messages) == 0
+
+    @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_request_id_format(self, mock_time, mock_get_state, mock_producer):
-        """Should format request_id correctly with timestamp divided by 60."""
+        """Should key request_id by phase and whole second."""
         
         current_time = 3660.0  # 61 minutes = 3660 seconds
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 2000,
-            "phase": "WARM",
-            "cooldown_calm_ms": 1000,
-        }
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
 
         watcher_lambda({}, None)
 
         message = mock_producer.produced_messages[0]
         payload = json.loads(message["value"].decode("utf-8"))
-        expected_minutes = timestamp_ms // 60
-        assert payload["request_id"] == f"phase_transition:{expected_minutes}"
+        assert payload["request_id"] == f"phase_transition:{Phases.WARM.value}:3660"
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_calls_poll_after_produce(self, mock_time, mock_get_state, mock_producer):
         """Should call poll after producing message."""
         
         current_time = 1000.0
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 2000,
-            "phase": "WARM",
-            "cooldown_calm_ms": 1000,
-        }
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
 
         watcher_lambda({}, None)
 
-        # send_message calls poll(0), which increments poll_count
+        # drain_producer calls poll(0) once after the send
         assert mock_producer.poll_count == 1
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_handles_large_timestamps(self, mock_time, mock_get_state, mock_producer):
         """Should handle large timestamp values correctly."""
         
         current_time = 1735689600.0  # A future timestamp
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 10000,
-            "phase": "HOT",
-            "cooldown_calm_ms": 5000,
-        }
+            "phase": Phases.HOT.value,
+            "ruleshash": "h",
+        }, _rules(chaos_ms=5000))
 
         result = watcher_lambda({}, None)
 
@@ -252,24 +305,140 @@ class TestWatcherLambda:
         
         message = mock_producer.produced_messages[0]
         payload = json.loads(message["value"].decode("utf-8"))
-        assert payload["ts"] == timestamp_ms
+        assert payload["timestamp_ms"] == timestamp_ms
 
     @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
-    @patch("watcher.watcher_lambda.get_latest_state")
-    @patch("time.time")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
     def test_handles_very_recent_update(self, mock_time, mock_get_state, mock_producer):
         """Should not send message when state was updated very recently."""
         
         current_time = 1000.0
         timestamp_ms = int(current_time * 1000)
-        mock_time.return_value = current_time
-        mock_get_state.return_value = {
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
             "updated_at_ms": timestamp_ms - 100,  # Only 100ms ago
-            "phase": "WARM",
-            "cooldown_calm_ms": 1000,
-        }
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
 
         result = watcher_lambda({}, None)
 
         assert result == {"success": True}
         assert len(mock_producer.produced_messages) == 0
+
+    @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_event_and_context_are_optional(self, mock_time, mock_get_state, mock_producer):
+        """Should run without Lambda event/context arguments."""
+        
+        mock_time.return_value = _ns(1000.0)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": 999900,
+            "phase": Phases.CALM.value,
+            "ruleshash": "h",
+        })
+
+        assert watcher_lambda() == {"success": True}
+
+    @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_hot_phase_uses_chaos_cooldown(self, mock_time, mock_get_state, mock_producer):
+        """Should compare a HOT state's age against cooldown_chaos_ms."""
+
+        current_time = 1000.0
+        timestamp_ms = int(current_time * 1000)
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": timestamp_ms - 2000,
+            "phase": Phases.HOT.value,
+            "ruleshash": "h",
+        }, _rules(warm_ms=100, chaos_ms=5000))
+
+        watcher_lambda({}, None)
+
+        assert len(mock_producer.produced_messages) == 0
+
+    @pytest.mark.parametrize("phase", [-1, 4, 7])
+    @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_unknown_phase_uses_calm_cooldown(self, mock_time, mock_get_state, mock_producer, phase):
+        """Should fall back to cooldown_calm_ms for phases outside CALM..CHAOS."""
+
+        current_time = 1000.0
+        timestamp_ms = int(current_time * 1000)
+        mock_time.return_value = _ns(current_time)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": timestamp_ms - 2000,
+            "phase": phase,
+            "ruleshash": "h",
+        }, _rules(calm_ms=1500, warm_ms=5000, chaos_ms=5000))
+
+        watcher_lambda({}, None)
+
+        assert len(mock_producer.produced_messages) == 1
+
+    @patch("watcher.watcher_lambda.PRODUCER", new_callable=FakeProducer)
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_caches_cooldowns_per_ruleshash(self, mock_time, mock_get_state, mock_producer):
+        """Should derive cooldowns once per ruleshash."""
+
+        mock_time.return_value = _ns(1000.0)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": 999000,
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
+
+        watcher_lambda({}, None)
+        watcher_lambda({}, None)
+
+        cache_info = watcher_module._phase_cooldowns.cache_info()
+        assert (cache_info.misses, cache_info.hits) == (1, 1)
+        assert cache_info.maxsize == RULES_CACHE_SIZE
+
+    @patch("watcher.watcher_lambda.PRODUCER", None)
+    @patch("watcher.watcher_lambda.create_producer")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_does_not_create_producer_without_transition(self, mock_time, mock_get_state, mock_create):
+        """Should not connect to Kafka when nothing needs to be sent."""
+
+        mock_time.return_value = _ns(1000.0)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": 999900,
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
+
+        watcher_lambda({}, None)
+
+        mock_create.assert_not_called()
+
+    @patch("watcher.watcher_lambda.PRODUCER", None)
+    @patch("watcher.watcher_lambda.atexit.register")
+    @patch("watcher.watcher_lambda.create_producer")
+    @patch("watcher.watcher_lambda.get_latest_state_with_rules")
+    @patch("time.time_ns")
+    def test_creates_producer_once_on_first_send(self, mock_time, mock_get_state, mock_create, mock_register):
+        """Should create the producer on the first send and reuse it after."""
+
+        producer = FakeProducer()
+        mock_create.return_value = producer
+        mock_time.return_value = _ns(1000.0)
+        mock_get_state.return_value = _loaded({
+            "updated_at_ms": 998000,
+            "phase": Phases.WARM.value,
+            "ruleshash": "h",
+        })
+
+        watcher_lambda({}, None)
+        watcher_lambda({}, None)
+
+        mock_create.assert_called_once()
+        mock_register.assert_called_once()
+        assert len(producer.produced_messages) == 2